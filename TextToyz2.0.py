@@ -82,6 +82,15 @@ _EMOJI_PATTERN = re.compile(
     flags=re.UNICODE,
 )
 _INVISIBLES_PATTERN = re.compile(r"[\u200D\u200C\uFE0E\uFE0F]")
+_NON_WORD_PATTERN = re.compile(r'[^a-zA-Z0-9]+')
+_HR_PATTERN = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_DASH_PATTERN = re.compile(r"[\u2010-\u2015\u2212]")
+_OPEN_SPACE_PATTERN = re.compile(r"([\(\[\{])\s+")
+_SPACE_CLOSE_PATTERN = re.compile(r"\s+([\)\]\}])")
+_EMPTY_BRACKETS_PATTERN = re.compile(r"[\(\[\{]\s*[\)\]\}]")
+_SPACE_PUNCT_PATTERN = re.compile(r"\s+([,.;:!?])")
+_BLANK_RUN_PATTERN = re.compile(r"[ \t\f\v]+")
+_PHP_PAIR_PATTERN = re.compile(r's:\d+:"(.*?)";s:\d+:"(.*?)";')
 
 IS_MAC = sys.platform == "darwin"
 
@@ -663,32 +672,39 @@ class TextToolsApp:
         self.diff_left.configure(state="normal"); self.diff_right.configure(state="normal")
         self.diff_left.delete("1.0", tk.END);     self.diff_right.delete("1.0", tk.END)
 
+        # one insert per pane, then one tag_add per tag with all of its ranges
+        left_ranges = {"line_del": [], "line_rep": [], "char_del": [], "char_rep": []}
+        right_ranges = {"line_add": [], "line_rep": [], "char_add": [], "char_rep": []}
         for idx, (l, r, tag) in enumerate(pairs, start=1):
-            l_start = f"{idx}.0"; r_start = f"{idx}.0"
-            self.diff_left.insert(tk.END, l + "\n")
-            self.diff_right.insert(tk.END, r + "\n")
+            line = (f"{idx}.0", f"{idx}.end")
             if tag == "delete":
-                self.diff_left.tag_add("line_del", l_start, f"{idx}.end")
+                left_ranges["line_del"] += line
             elif tag == "insert":
-                self.diff_right.tag_add("line_add", r_start, f"{idx}.end")
+                right_ranges["line_add"] += line
             elif tag == "replace":
-                self.diff_left.tag_add("line_rep", l_start, f"{idx}.end")
-                self.diff_right.tag_add("line_rep", r_start, f"{idx}.end")
-                self._highlight_char_diffs(idx, l, r)
+                left_ranges["line_rep"] += line
+                right_ranges["line_rep"] += line
+                self._highlight_char_diffs(idx, l, r, left_ranges, right_ranges)
+        self.diff_left.insert(tk.END, "".join(l + "\n" for l, _, _ in pairs))
+        self.diff_right.insert(tk.END, "".join(r + "\n" for _, r, _ in pairs))
+        for widget, ranges in ((self.diff_left, left_ranges), (self.diff_right, right_ranges)):
+            for tag, idx in ranges.items():
+                if idx:
+                    widget.tag_add(tag, *idx)
 
         self.diff_left.configure(state="disabled"); self.diff_right.configure(state="disabled")
         # refresh line numbers for diff
         self._redraw_linenumbers(self.diff_left_ln, self.diff_left)
         self._redraw_linenumbers(self.diff_right_ln, self.diff_right)
 
-    def _highlight_char_diffs(self, line_no: int, left: str, right: str):
+    def _highlight_char_diffs(self, line_no: int, left: str, right: str, left_ranges: dict, right_ranges: dict):
         sm = difflib.SequenceMatcher(a=left, b=right)
         for tag, a1, a2, b1, b2 in sm.get_opcodes():
             if tag == "equal": continue
             if a1 != a2:
-                self.diff_left.tag_add("char_del" if tag == "delete" else "char_rep", f"{line_no}.{a1}", f"{line_no}.{a2}")
+                left_ranges["char_del" if tag == "delete" else "char_rep"] += (f"{line_no}.{a1}", f"{line_no}.{a2}")
             if b1 != b2:
-                self.diff_right.tag_add("char_add" if tag == "insert" else "char_rep", f"{line_no}.{b1}", f"{line_no}.{b2}")
+                right_ranges["char_add" if tag == "insert" else "char_rep"] += (f"{line_no}.{b1}", f"{line_no}.{b2}")
 
     # --- diff scrolling sync ---
     def _sync_y(self, *args, which='left'):
@@ -746,7 +762,7 @@ class TextToolsApp:
     # -------------------- Processing --------------------
     @staticmethod
     def to_snake_token(s: str) -> str:
-        s = re.sub(r'[^a-zA-Z0-9]+', '_', s)
+        s = _NON_WORD_PATTERN.sub('_', s)
         return s.strip('_').lower()
 
     @staticmethod
@@ -774,25 +790,23 @@ class TextToolsApp:
     @staticmethod
     def normalize_after_removal(text: str) -> str:
         processed_lines = []
-        hr_pattern = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
         for line in text.splitlines():
-            if hr_pattern.match(line):
+            if _HR_PATTERN.match(line):
                 processed_lines.append(line); continue
             line = line.replace("\u00A0", " ")
-            line = re.sub(r"[\u2010-\u2015\u2212]", " - ", line)
-            line = re.sub(r"([\(\[\{])\s+", r"\1", line)
-            line = re.sub(r"\s+([\)\]\}])", r"\1", line)
-            line = re.sub(r"[\(\[\{]\s*[\)\]\}]", "", line)
-            line = re.sub(r"\s+([,.;:!?])", r"\1", line)
-            line = re.sub(r"[ \t\f\v]+", " ", line)
+            line = _DASH_PATTERN.sub(" - ", line)
+            line = _OPEN_SPACE_PATTERN.sub(r"\1", line)
+            line = _SPACE_CLOSE_PATTERN.sub(r"\1", line)
+            line = _EMPTY_BRACKETS_PATTERN.sub("", line)
+            line = _SPACE_PUNCT_PATTERN.sub(r"\1", line)
+            line = _BLANK_RUN_PATTERN.sub(" ", line)
             processed_lines.append(line.rstrip())
         return "\n".join(processed_lines)
 
     # Commands
     def process_php_to_json(self):
         input_text = self._get_text(self.text_input)
-        pattern = r's:\d+:"(.*?)";s:\d+:"(.*?)";'
-        matches = re.findall(pattern, input_text)
+        matches = _PHP_PAIR_PATTERN.findall(input_text)
         data_dict = {k: v for k, v in matches if not any(x in k or x in v for x in ['\";', 'a:', 'i:', 'b:', 'N'])}
         json_output = json.dumps(data_dict, indent=2, ensure_ascii=False)
         self.write_to_output(json_output)
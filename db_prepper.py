@@ -1,11 +1,18 @@
-import os, sys, csv, zipfile, sqlite3, traceback, re
+import os, sys, csv, zipfile, sqlite3, traceback, re, atexit, hashlib
+from array import array
 import xml.etree.ElementTree as ET
+from itertools import chain, count, islice
+from operator import itemgetter
 from datetime import datetime
+from types import SimpleNamespace
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
 APP_TITLE = "Data Prep Dashboard — Max UI"
 DEFAULT_PREVIEW_ROWS = 20
+DEDUP_HASH_MIN_ROWS = 100_000
+FILTER_DEBOUNCE_MS = 150
+TREE_WINDOW_ROWS = 500
 CSV_ENCODINGS = ["Auto", "utf-8-sig", "utf-8", "utf-16", "cp1252", "latin-1"]
 
 def ts_tag():
@@ -42,10 +49,12 @@ def dedupe_headers(headers):
         out.append(base if n == 1 else f"{base}_{n}")
     return out
 
+def _csv_encodings_to_try(enc_pref):
+    return [e for e in CSV_ENCODINGS if e != "Auto"] if enc_pref != "Auto" else ["utf-8-sig", "utf-8", "utf-16", "cp1252", "latin-1"]
+
 def _read_csv_with_encodings(path, enc_pref="Auto", max_rows=None):
-    tried = [e for e in CSV_ENCODINGS if e != "Auto"] if enc_pref != "Auto" else ["utf-8-sig", "utf-8", "utf-16", "cp1252", "latin-1"]
     last_exc = None
-    for enc in tried:
+    for enc in _csv_encodings_to_try(enc_pref):
         try:
             out = []
             with open(path, newline="", encoding=enc, errors="replace") as f:
@@ -69,6 +78,65 @@ def load_csv_preview(path, enc_pref, max_rows):
 def load_csv_full(path, enc_pref):
     return _read_csv_with_encodings(path, enc_pref, None)
 
+def column_getter(header, columns):
+    """
+    Resolve columns against header once. Returns (present_columns, get) where
+    get(row) is a tuple of the row's values for those columns, with "" for
+    cells past the end of a short row.
+    """
+    pos = {}
+    for i, h in enumerate(header):
+        pos.setdefault(h, i)
+    cols = [c for c in columns if c in pos]
+    idx = [pos[c] for c in cols]
+    if not idx:
+        return cols, lambda r: ()
+    if len(idx) == 1:
+        i = idx[0]
+        return cols, lambda r: (r[i],) if i < len(r) else ("",)
+    take = itemgetter(*idx)
+    width = max(idx) + 1
+    pad = [""] * width
+    def get(r):
+        if len(r) < width:
+            r = list(r) + pad[len(r):]
+        return take(r)
+    return cols, get
+
+def project_rows(rows, columns):
+    """
+    Yield the columns present in the (snake_cased) header row, then every data
+    row projected onto them. Works on any row iterable without materialising it.
+    """
+    it = iter(rows)
+    cols, get = column_getter(dedupe_headers(next(it, [])), columns)
+    yield cols
+    yield from map(get, it)
+
+def iter_csv_full(path, enc_pref, columns):
+    """Stream a CSV through project_rows, using the first encoding that reads a header."""
+    last_exc = None
+    for enc in _csv_encodings_to_try(enc_pref):
+        try:
+            f = open(path, newline="", encoding=enc, errors="replace")
+        except Exception as e:
+            last_exc = e
+            continue
+        with f:
+            r = csv.reader(f)
+            try:
+                first = next(r, None)
+            except Exception as e:
+                last_exc = e
+                continue
+            if first is None:
+                continue
+            yield from project_rows(chain([first], r), columns)
+            return
+    if last_exc:
+        raise last_exc
+    raise ValueError("CSV read failed with all encodings")
+
 NS_MAIN = {"main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
 NS_REL  = {"rel": "http://schemas.openxmlformats.org/package/2006/relationships"}
 
@@ -102,6 +170,48 @@ def _xlsx_load_shared_strings(z):
     except Exception:
         return []
 
+class SharedStrings:
+    """
+    Lazily parsed xl/sharedStrings.xml. Entries are read from the stream only
+    up to the highest index looked up so far, so a preview that touches a few
+    cells never materialises the whole table.
+    """
+    _SI = "{%s}si" % NS_MAIN["main"]
+
+    def __init__(self, z):
+        self._z = z
+        self._items = []
+        self._f = None
+        self._it = None
+        self._done = False
+
+    def __getitem__(self, i):
+        if i < 0:
+            raise IndexError(i)
+        while i >= len(self._items) and not self._done:
+            self._advance()
+        return self._items[i]
+
+    def _advance(self):
+        try:
+            if self._it is None:
+                self._f = self._z.open("xl/sharedStrings.xml")
+                self._it = ET.iterparse(self._f, events=("end",))
+            for _, el in self._it:
+                if el.tag == self._SI:
+                    self._items.append("".join(el.itertext()))
+                    el.clear()
+                    return
+        except Exception:
+            pass
+        self.close()
+
+    def close(self):
+        self._done = True
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
 def _col_letters_to_index(col_ref):
     res = 0
     for ch in col_ref:
@@ -111,50 +221,73 @@ def _col_letters_to_index(col_ref):
             res = res * 26 + (ord(ch) - ord("a") + 1)
     return max(res - 1, 0)
 
-def _xlsx_read_sheet(z, target_rel_path, shared, max_rows=None):
+_TAG_SHEET_DATA = "{%s}sheetData" % NS_MAIN["main"]
+_TAG_ROW = "{%s}row" % NS_MAIN["main"]
+_TAG_C = "{%s}c" % NS_MAIN["main"]
+_TAG_V = "{%s}v" % NS_MAIN["main"]
+
+def _xlsx_iter_sheet(z, target_rel_path, shared, max_rows=None):
+    """
+    Stream the sheet XML row by row; each <row> element is dropped from the
+    tree once converted, so only the rows handed out stay in memory.
+    """
     sheet_path = "xl/" + target_rel_path.lstrip("/")
+    n = 0
     with z.open(sheet_path) as f:
-        root = ET.parse(f).getroot()
-    rows = []
-    for r_i, row in enumerate(root.findall("main:sheetData/main:row", NS_MAIN)):
-        max_ci = -1
-        parsed = []
-        for c in row.findall("main:c", NS_MAIN):
-            addr = c.attrib.get("r", "A1")
-            letters = "".join([ch for ch in addr if ch.isalpha()])
-            ci = _col_letters_to_index(letters)
-            max_ci = max(max_ci, ci)
-            v = c.find("main:v", NS_MAIN)
-            val = ""
-            if v is not None and v.text is not None:
-                if c.attrib.get("t") == "s":
-                    try:
-                        idx = int(v.text)
-                        val = shared[idx] if 0 <= idx < len(shared) else v.text
-                    except Exception:
+        sheet_data = None
+        for event, el in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if el.tag == _TAG_SHEET_DATA:
+                    sheet_data = el
+                continue
+            if el.tag != _TAG_ROW:
+                continue
+            row_vals = []
+            for c in el.iterfind(_TAG_C):
+                ci = _col_letters_to_index(c.attrib.get("r", "A1"))
+                v = c.find(_TAG_V)
+                val = ""
+                if v is not None and v.text is not None:
+                    if c.attrib.get("t") == "s":
+                        try:
+                            idx = int(v.text)
+                            val = shared[idx] if idx >= 0 else v.text
+                        except Exception:
+                            val = v.text
+                    else:
                         val = v.text
-                else:
-                    val = v.text
-            parsed.append((ci, str(val)))
-        row_vals = ["" for _ in range(max_ci + 1)] if max_ci >= 0 else []
-        for ci, val in parsed:
-            if 0 <= ci < len(row_vals):
-                row_vals[ci] = val
-        rows.append(row_vals)
-        if max_rows and r_i >= max_rows:
-            break
-    return rows
+                if ci >= len(row_vals):
+                    row_vals.extend([""] * (ci + 1 - len(row_vals)))
+                row_vals[ci] = str(val)
+            if sheet_data is not None:
+                sheet_data.clear()
+            yield row_vals
+            n += 1
+            if max_rows and n > max_rows:
+                break
+
+def _xlsx_read_sheet(z, target_rel_path, shared, max_rows=None):
+    return list(_xlsx_iter_sheet(z, target_rel_path, shared, max_rows))
 
 def load_xlsx_preview(path, sheet_target, max_rows):
     with zipfile.ZipFile(path) as z:
-        shared = _xlsx_load_shared_strings(z)
-        return _xlsx_read_sheet(z, sheet_target, shared, max_rows)
+        shared = SharedStrings(z)
+        try:
+            return _xlsx_read_sheet(z, sheet_target, shared, max_rows)
+        finally:
+            shared.close()
 
 def load_xlsx_full(path, sheet_target):
     with zipfile.ZipFile(path) as z:
         shared = _xlsx_load_shared_strings(z)
         return _xlsx_read_sheet(z, sheet_target, shared, None)
 
+def iter_xlsx_full(path, sheet_target, columns):
+    """Stream a worksheet through project_rows."""
+    with zipfile.ZipFile(path) as z:
+        shared = _xlsx_load_shared_strings(z)
+        yield from project_rows(_xlsx_iter_sheet(z, sheet_target, shared), columns)
+
 def preview_slice(data, n):
     if not data:
         return []
@@ -178,6 +311,8 @@ def detect_duplicates(data, key_columns):
         idx = [hdr.index(c) for c in key_columns]
     except ValueError:
         return []
+    if len(data) - 1 >= DEDUP_HASH_MIN_ROWS:
+        return _detect_duplicates_hashed(data, idx)
     seen, dupes = set(), []
     for r in data[1:]:
         key = tuple((r[i] if i < len(r) else "") for i in idx)
@@ -187,9 +322,117 @@ def detect_duplicates(data, key_columns):
             seen.add(key)
     return dupes
 
+def _key_hash(r, idx):
+    key = "\x1f".join((r[i] if i < len(r) else "") for i in idx)
+    digest = hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def _detect_duplicates_hashed(data, idx):
+    """
+    Two-pass variant for large inputs: pass one keeps only a 64-bit hash per
+    row and notes hashes seen more than once; pass two compares the real keys
+    of just those rows, so hash collisions never produce false duplicates.
+    """
+    hashes = array("Q")
+    seen, repeated = set(), set()
+    for r in data[1:]:
+        h = _key_hash(r, idx)
+        hashes.append(h)
+        if h in seen:
+            repeated.add(h)
+        else:
+            seen.add(h)
+    del seen
+    if not repeated:
+        return []
+    seen_keys, dupes = set(), []
+    for r, h in zip(data[1:], hashes):
+        if h not in repeated:
+            continue
+        key = tuple((r[i] if i < len(r) else "") for i in idx)
+        if key in seen_keys:
+            dupes.append(r)
+        else:
+            seen_keys.add(key)
+    return dupes
+
+EXPORT_BUFFER_SIZE = 1 << 20
+
 def export_csv(rows, out_path):
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
-        csv.writer(f).writerows(rows)
+    """Write rows (header first, any iterable); returns the number of data rows."""
+    it = iter(rows)
+    counter = count()
+    with open(out_path, "w", newline="", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE) as f:
+        w = csv.writer(f)
+        header = next(it, None)
+        if header is not None:
+            w.writerow(header)
+        # zip pulls a row before ticking the counter, so it ends at the row count
+        w.writerows(r for r, _ in zip(it, counter))
+    return next(counter)
+
+SQLITE_MAX_VARIABLES = 999
+UPSERT_SUPPORTED = sqlite3.sqlite_version_info >= (3, 24, 0)
+MULTI_ROW_INSERT = 500
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-200000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+def open_db(db_path):
+    """Open a SQLite connection with the tuning PRAGMAs applied once."""
+    conn = sqlite3.connect(db_path, cached_statements=256)
+    conn.set_trace_callback(None)
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def _row_normalizer(n, empty_as_null):
+    """Build a row -> n-tuple converter specialised for the header width."""
+    pad = ("",) * n
+    if empty_as_null:
+        def norm_row(r):
+            v = tuple(None if x == "" else x for x in r[:n])
+            return v + pad[len(v):]
+    else:
+        def norm_row(r):
+            v = tuple(r[:n])
+            return v + pad[len(v):]
+    return norm_row
+
+def _insert_rows(conn, verb, table, headers, rows, conflict=""):
+    """
+    Insert normalised row tuples using multi-row VALUES statements of up to
+    MULTI_ROW_INSERT rows (clamped to SQLITE_MAX_VARIABLES bound parameters).
+    The tail that does not fill a whole statement goes through executemany.
+    conflict is appended to every statement (e.g. an ON CONFLICT clause).
+    """
+    n = len(headers)
+    col_names = ", ".join(f'"{c}"' for c in headers)
+    one = "(" + ", ".join("?" * n) + ")"
+    k = max(1, min(MULTI_ROW_INSERT, SQLITE_MAX_VARIABLES // n))
+    prefix = f'{verb} INTO "{table}" ({col_names}) VALUES '
+    multi_sql = prefix + ", ".join([one] * k) + conflict
+    it = iter(rows)
+    total = 0
+    while True:
+        chunk = list(islice(it, k))
+        if len(chunk) < k:
+            break
+        total += conn.execute(multi_sql, list(chain.from_iterable(chunk))).rowcount
+    if chunk:
+        total += conn.executemany(prefix + one + conflict, chunk).rowcount
+    return total
+
+def _on_conflict_clause(headers, key_cols):
+    keys = ", ".join(f'"{c}"' for c in key_cols)
+    updates = ", ".join(f'"{c}"=excluded."{c}"' for c in headers if c not in key_cols)
+    if not updates:
+        return f" ON CONFLICT ({keys}) DO NOTHING"
+    return f" ON CONFLICT ({keys}) DO UPDATE SET {updates}"
 
 def _table_exists(cur, table):
     row = cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?;", (table,)).fetchone()
@@ -198,59 +441,94 @@ def _table_exists(cur, table):
 def _existing_columns(cur, table):
     return [r[1] for r in cur.execute(f'PRAGMA table_info("{table}")').fetchall()]
 
-def upsert_to_db(rows, db_path, table, *, unique_cols=None, empty_as_null=False, mode="append"):
+def _table_is_empty(cur, table):
+    return cur.execute(f'SELECT 1 FROM "{table}" LIMIT 1').fetchone() is None
+
+def _create_unique_index(cur, table, unique_cols, key_cols):
+    idx_name = f"uniq_{table}_" + "_".join([str(abs(hash(c)))[:6] for c in unique_cols])
+    cols_list = ", ".join(f'"{c}"' for c in key_cols)
+    cur.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{idx_name}" ON "{table}" ({cols_list})')
+
+def _drop_key_duplicates(cur, table, key_cols):
+    """Keep the last row per key, as INSERT OR REPLACE would have (NULL keys never clash)."""
+    cols_list = ", ".join(f'"{c}"' for c in key_cols)
+    not_null = " AND ".join(f'"{c}" IS NOT NULL' for c in key_cols)
+    cur.execute(
+        f'DELETE FROM "{table}" WHERE {not_null} AND rowid NOT IN '
+        f'(SELECT MAX(rowid) FROM "{table}" WHERE {not_null} GROUP BY {cols_list})'
+    )
+
+def upsert_to_db(rows, db_path, table, *, unique_cols=None, empty_as_null=False, mode="append", conn=None):
     """
     mode:
       - 'replace': drop existing table and recreate
       - 'append' : keep table, add missing TEXT columns, then insert
       - 'error'  : raise if table exists
+
+    rows: header row first, then data rows; any iterable, consumed once.
+    conn: optional open connection (see open_db); it is left open for reuse.
+    Without one, a connection to db_path is opened and closed here.
     """
-    if not rows or not rows[0]:
+    rows = iter(rows)
+    headers = next(rows, None)
+    if not headers:
         raise ValueError("No data to upsert")
-    headers = rows[0]
-    body = rows[1:]
+    own_conn = conn is None
+    if own_conn:
+        conn = open_db(db_path)
+    try:
+        return _upsert_rows(conn, headers, rows, table, unique_cols, empty_as_null, mode)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
 
-    conn = sqlite3.connect(db_path)
+def _upsert_rows(conn, headers, body, table, unique_cols, empty_as_null, mode):
     cur = conn.cursor()
+    # one transaction for DDL and rows alike: a failed load rolls back cleanly
+    if not conn.in_transaction:
+        cur.execute("BEGIN")
 
     exists = _table_exists(cur, table)
 
     if exists and mode == "error":
-        conn.close()
         raise ValueError(f"Table '{table}' already exists (mode=error).")
 
     if exists and mode == "replace":
         cur.execute(f'DROP TABLE IF EXISTS "{table}"')
 
+    created = False
     if not _table_exists(cur, table):
         cols_def = ", ".join(f'"{c}" TEXT' for c in headers)
         cur.execute(f'CREATE TABLE "{table}" ({cols_def})')
+        created = True
     elif mode == "append":
         current = set(_existing_columns(cur, table))
         for c in headers:
             if c not in current:
                 cur.execute(f'ALTER TABLE "{table}" ADD COLUMN "{c}" TEXT')
 
-    if unique_cols:
-        idx_name = f"uniq_{table}_" + "_".join([str(abs(hash(c)))[:6] for c in unique_cols])
-        cols_list = ", ".join(f'"{c}"' for c in unique_cols if c in headers)
-        if cols_list:
-            cur.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{idx_name}" ON "{table}" ({cols_list})')
-
-    placeholders = ", ".join("?" for _ in headers)
-    col_names   = ", ".join(f'"{c}"' for c in headers)
-    verb = "INSERT OR REPLACE" if unique_cols else "INSERT"
-    sql = f'{verb} INTO "{table}" ({col_names}) VALUES ({placeholders})'
-
-    def norm_row(r):
-        vals = [(None if (empty_as_null and v == "") else v) for v in r]
-        vals += [""] * max(0, len(headers) - len(vals))
-        return tuple(vals[:len(headers)])
-
-    cur.executemany(sql, (norm_row(r) for r in body))
+    # loading into an empty table: skip per-row index maintenance and build
+    # the unique index once the rows are in
+    bulk = created or _table_is_empty(cur, table)
+    key_cols = [c for c in (unique_cols or []) if c in headers]
+    if key_cols and not bulk:
+        _create_unique_index(cur, table, unique_cols, key_cols)
+
+    verb, conflict = "INSERT", ""
+    if key_cols and not bulk and UPSERT_SUPPORTED:
+        conflict = _on_conflict_clause(headers, key_cols)
+    elif unique_cols:
+        verb = "INSERT OR REPLACE"
+    norm_row = _row_normalizer(len(headers), empty_as_null)
+    cnt = _insert_rows(conn, verb, table, headers, map(norm_row, body), conflict)
+    if key_cols and bulk:
+        _drop_key_duplicates(cur, table, key_cols)
+        _create_unique_index(cur, table, unique_cols, key_cols)
+        cur.execute(f'ANALYZE "{table}"')
     conn.commit()
-    cnt = cur.rowcount if cur.rowcount != -1 else len(body)
-    conn.close()
     return cnt
 
 class ScrollableFrame(ttk.Frame):
@@ -279,6 +557,127 @@ class ScrollableFrame(ttk.Frame):
     def _on_wheel_h(self, e):
         self.canvas.xview_scroll(int(-1 * (e.delta / 120)), "units")
 
+class TreeWindow:
+    """
+    Keeps at most TREE_WINDOW_ROWS rows inserted in a Treeview and maps its
+    vertical scrollbar onto the full row list, refilling the window whenever
+    the view would run past either edge of it.
+    """
+    def __init__(self, tree, vsb):
+        self.tree = tree
+        self.vsb = vsb
+        self.rows = []
+        self.width = 0
+        self.first = 0
+        self.count = 0
+        tree.configure(yscrollcommand=self._on_tree_yview)
+        vsb.configure(command=self._on_scrollbar)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(seq, self._on_wheel)
+        for seq in ("<Up>", "<Down>", "<Prior>", "<Next>"):
+            tree.bind(seq, self._on_key)
+
+    def set_rows(self, rows, width):
+        self.rows = rows
+        self.width = width
+        self._fill(0, bulk=True)
+        self.tree.yview_moveto(0)
+
+    def _fill(self, first, bulk=False):
+        tree = self.tree
+        tree.delete(*tree.get_children())
+        self.first = first
+        n = self.width
+        pad = [""] * n
+        insert = tree.insert
+        window = self.rows[first:first + TREE_WINDOW_ROWS]
+        # a new data set: unmap while inserting so Tk lays the view out once, not per row.
+        # Scroll refills stay mapped; every window after the first has the same row count,
+        # so the Treeview's scroll range is already right and yview_moveto can follow at once.
+        if bulk:
+            tree.grid_remove()
+        try:
+            for r in window:
+                # FIX: guard against row length, not header length
+                values = r[:n] if len(r) >= n else list(r) + pad[len(r):]
+                insert("", "end", values=values)
+        finally:
+            if bulk:
+                tree.grid()
+        self.count = len(window)
+        if bulk:
+            tree.update_idletasks()
+
+    def _windowed(self):
+        return len(self.rows) > self.count
+
+    def _on_tree_yview(self, lo, hi):
+        total = len(self.rows)
+        if not self._windowed():
+            self.vsb.set(lo, hi)
+            return
+        n = self.count
+        self.vsb.set((self.first + float(lo) * n) / total, (self.first + float(hi) * n) / total)
+
+    def _on_scrollbar(self, *args):
+        if not self._windowed():
+            return self.tree.yview(*args)
+        lo, hi = self.tree.yview()
+        top = self.first + lo * self.count
+        visible = max(1.0, (hi - lo) * self.count)
+        if args[0] == "moveto":
+            target = float(args[1]) * len(self.rows)
+        else:
+            step = int(args[1])
+            target = top + step * (visible if args[2] == "pages" else 1)
+        self._goto(target, visible)
+
+    def _on_wheel(self, e):
+        if not self._windowed():
+            return None  # Treeview's own wheel binding scrolls it
+        if e.num == 4:
+            step = -1
+        elif e.num == 5:
+            step = 1
+        else:
+            step = int(-1 * (e.delta / 120))
+        self._on_scrollbar("scroll", step, "units")
+        return "break"
+
+    def _on_key(self, e):
+        if not self._windowed():
+            return None
+        if e.keysym in ("Prior", "Next"):
+            self._on_scrollbar("scroll", -1 if e.keysym == "Prior" else 1, "pages")
+            return "break"
+        tree = self.tree
+        cur = tree.focus()
+        if not cur:
+            return None
+        step = -1 if e.keysym == "Up" else 1
+        row = self.first + tree.index(cur) + step
+        if self.first <= row < self.first + self.count:
+            return None  # still inside the window: the default binding moves and scrolls
+        if not 0 <= row < len(self.rows):
+            return "break"
+        # past the edge of the window: refill around the row, then move the focus onto it
+        lo, hi = tree.yview()
+        visible = max(1.0, (hi - lo) * self.count)
+        self._goto(row - (visible - 1 if step > 0 else 0), visible)
+        item = tree.get_children()[row - self.first]
+        tree.focus(item)
+        tree.selection_set(item)
+        tree.see(item)
+        return "break"
+
+    def _goto(self, target, visible):
+        total = len(self.rows)
+        target = min(max(0.0, target), max(0.0, total - visible))
+        if target < self.first or target + visible > self.first + self.count:
+            first = int(target) - (TREE_WINDOW_ROWS - int(visible)) // 2
+            self._fill(max(0, min(first, total - TREE_WINDOW_ROWS)))
+        self.tree.yview_moveto((target - self.first) / self.count)
+
 class DataPrepApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -315,10 +714,21 @@ class DataPrepApp(tk.Tk):
         self.headers = []
         self.data_preview = []
         self.data_full = None
+        self._data_full_key = None
+        self._preview_hay = []
+        self._preview_hay_key = None
+        self._filter_job = None
+        self._tree_windows = {}
+        self._cb_pool = []
         self.col_vars = {}
         self.xlsx_sheet_map = []
+        self._file_type = None
+        self.path_var.trace_add("write", self._on_path_changed)
+        self._db_conns = {}
+        atexit.register(self._close_db_conns)
 
         self._build_layout()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _setup_styles(self):
         s = ttk.Style()
@@ -447,7 +857,7 @@ class DataPrepApp(tk.Tk):
         ttk.Label(top, text="Filter").grid(row=0, column=0, padx=(8,6))
         ent = ttk.Entry(top, textvariable=self.filter_var)
         ent.grid(row=0, column=1, sticky="ew", padx=(0,8))
-        ent.bind("<KeyRelease>", lambda e: self._apply_filter())
+        ent.bind("<KeyRelease>", lambda e: self._schedule_filter())
         ttk.Button(top, text="Refresh", command=lambda: self._render_tree(self._filtered_preview_rows(apply_filter=True))).grid(row=0, column=2, sticky="e", padx=8)
 
         frame = ttk.Frame(parent, style="Panel.TFrame")
@@ -458,9 +868,10 @@ class DataPrepApp(tk.Tk):
         frame.grid_columnconfigure(0, weight=1)
 
         self.tree = ttk.Treeview(frame, columns=(), show="headings")
-        vsb = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        vsb = ttk.Scrollbar(frame, orient="vertical")
         hsb = ttk.Scrollbar(frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscroll=vsb.set, xscroll=hsb.set)
+        self.tree.configure(xscroll=hsb.set)
+        self._tree_windows[str(self.tree)] = TreeWindow(self.tree, vsb)
         self.tree.grid(row=0, column=0, sticky="nsew")
         vsb.grid(row=0, column=1, sticky="ns")
         hsb.grid(row=1, column=0, sticky="ew")
@@ -480,9 +891,10 @@ class DataPrepApp(tk.Tk):
         frame.grid_columnconfigure(0, weight=1)
 
         self.tree_dupes = ttk.Treeview(frame, columns=(), show="headings")
-        vsb = ttk.Scrollbar(frame, orient="vertical", command=self.tree_dupes.yview)
+        vsb = ttk.Scrollbar(frame, orient="vertical")
         hsb = ttk.Scrollbar(frame, orient="horizontal", command=self.tree_dupes.xview)
-        self.tree_dupes.configure(yscroll=vsb.set, xscroll=hsb.set)
+        self.tree_dupes.configure(xscroll=hsb.set)
+        self._tree_windows[str(self.tree_dupes)] = TreeWindow(self.tree_dupes, vsb)
         self.tree_dupes.grid(row=0, column=0, sticky="nsew")
         vsb.grid(row=0, column=1, sticky="ns")
         hsb.grid(row=1, column=0, sticky="ew")
@@ -535,6 +947,8 @@ class DataPrepApp(tk.Tk):
         if not path:
             return
         self.path_var.set(path)
+        self.data_full = None
+        self._data_full_key = None
         self._discover_xlsx_sheets_if_any(path)
 
     def _discover_xlsx_sheets_if_any(self, path):
@@ -544,7 +958,8 @@ class DataPrepApp(tk.Tk):
         self.sheet_combo.configure(state="disabled", values=[])
         self.settings_sheet_combo.configure(state="readonly", values=[])
 
-        if path.lower().endswith(".xlsx") and os.path.exists(path):
+        ft = self._current_file_type()
+        if ft is not None and ft.kind == "xlsx":
             try:
                 with zipfile.ZipFile(path) as z:
                     self.xlsx_sheet_map = xlsx_list_sheets(z)
@@ -557,6 +972,22 @@ class DataPrepApp(tk.Tk):
             except Exception as e:
                 safe_log(self.log_widget, f"[warn] Failed to enumerate sheets: {e}")
 
+    def _on_path_changed(self, *_):
+        self._file_type = None
+
+    def _current_file_type(self):
+        """Cached (path, kind, size, mtime) record for path_var; None if missing."""
+        if self._file_type is None:
+            path = self.path_var.get().strip()
+            try:
+                st = os.stat(path)
+            except (OSError, ValueError):
+                return None
+            low = path.lower()
+            kind = "xlsx" if low.endswith(".xlsx") else "csv" if low.endswith(".csv") else None
+            self._file_type = SimpleNamespace(path=path, kind=kind, size=st.st_size, mtime=st.st_mtime)
+        return self._file_type
+
     def _sheet_target_by_name(self, name):
         for n, t in self.xlsx_sheet_map:
             if n == name:
@@ -575,10 +1006,11 @@ class DataPrepApp(tk.Tk):
         return snake
 
     def on_load_preview(self):
-        path = self.path_var.get().strip()
-        if not path or not os.path.exists(path):
+        ft = self._current_file_type()
+        if ft is None:
             messagebox.showerror("Error", "File not found.")
             return
+        path = ft.path
         try:
             n = max(1, int(self.preview_rows_var.get()))
         except Exception:
@@ -586,10 +1018,10 @@ class DataPrepApp(tk.Tk):
             self.preview_rows_var.set(n)
 
         try:
-            if path.lower().endswith(".csv"):
+            if ft.kind == "csv":
                 data, used_enc = load_csv_preview(path, self.csv_enc_var.get(), n)
                 safe_log(self.log_widget, f"[info] CSV preview loaded using encoding={used_enc}")
-            elif path.lower().endswith(".xlsx"):
+            elif ft.kind == "xlsx":
                 target = self.selected_sheet_target or "worksheets/sheet1.xml"
                 data = load_xlsx_preview(path, target, n)
                 safe_log(self.log_widget, f"[info] XLSX preview loaded from sheet={self.selected_sheet_name.get() or 'sheet1'}")
@@ -602,6 +1034,7 @@ class DataPrepApp(tk.Tk):
 
             self.headers = self._apply_snake_headers(data)
             self.data_preview = data
+            self._preview_hay_key = None
 
             self._build_column_checklist(self.headers)
             self._render_tree(self._filtered_preview_rows(apply_filter=True))
@@ -626,32 +1059,45 @@ class DataPrepApp(tk.Tk):
             messagebox.showerror("Error", "Select at least one column.")
             return
         try:
-            # ensure full data
-            if self.data_full is None:
-                if self.path_var.get().lower().endswith(".csv"):
-                    self.data_full, used = load_csv_full(self.path_var.get(), self.csv_enc_var.get())
-                    safe_log(self.log_widget, f"[info] CSV full load encoding={used}")
-                else:
-                    tgt = self.selected_sheet_target or "worksheets/sheet1.xml"
-                    self.data_full = load_xlsx_full(self.path_var.get(), tgt)
-                    safe_log(self.log_widget, f"[info] XLSX full load from sheet={self.selected_sheet_name.get() or 'sheet1'}")
-                # apply same snake_case header to full data
-                self._apply_snake_headers(self.data_full)
-
-            hdr = self.data_full[0]
-            idx = [hdr.index(c) for c in sel if c in hdr]
-            filtered_full = [sel] + [[(r[i] if i < len(r) else "") for i in idx] for r in self.data_full[1:]]
-            dupes = detect_duplicates(filtered_full, sel)
+            self._ensure_full_data()
+
+            cols, get = column_getter(self.data_full[0], sel)
+            filtered_full = [cols]
+            filtered_full.extend(map(get, islice(self.data_full, 1, None)))
+            dupes = detect_duplicates(filtered_full, cols)
 
             self.analysis_label.configure(text=f"Duplicates found: {len(dupes)}", style=("Warn.TLabel" if dupes else "Ok.TLabel"))
             # IMPORTANT: fix IndexError by guarding against row length, not header length
-            self._render_tree_generic(self.tree_dupes, [sel] + dupes)
+            self._render_tree_generic(self.tree_dupes, [cols] + dupes)
             # also refresh preview pane with filtered view
             self._render_tree(preview_slice(filtered_full, self.preview_rows_var.get()))
             self.status_var.set("Analyze complete.")
         except Exception as e:
             self._show_exception("Analyze failed", e)
 
+    def _ensure_full_data(self):
+        """Load and snake_case data_full once per (path, mtime, size, encoding, sheet)."""
+        # re-stat: the cached record only resets on a path change, not when the file is edited
+        self._file_type = None
+        ft = self._current_file_type()
+        path = self.path_var.get()
+        tgt = self.selected_sheet_target or "worksheets/sheet1.xml"
+        key = (path, ft.mtime if ft else None, ft.size if ft else None, self.csv_enc_var.get(), tgt)
+        if self.data_full is not None and key == self._data_full_key:
+            return
+        self.data_full = None
+        self._data_full_key = None
+        if ft is not None and ft.kind == "csv":
+            data, used = load_csv_full(path, self.csv_enc_var.get())
+            safe_log(self.log_widget, f"[info] CSV full load encoding={used}")
+        else:
+            data = load_xlsx_full(path, tgt)
+            safe_log(self.log_widget, f"[info] XLSX full load from sheet={self.selected_sheet_name.get() or 'sheet1'}")
+        # apply same snake_case header to full data
+        self._apply_snake_headers(data)
+        self.data_full = data
+        self._data_full_key = key
+
     def on_export_csv(self):
         if not self.headers or not self._selected_columns():
             messagebox.showerror("Error", "Load preview and select columns first.")
@@ -666,9 +1112,9 @@ class DataPrepApp(tk.Tk):
             return
         try:
             rows = self._filtered_full_or_preview_rows(for_export=True, apply_filter=False)
-            export_csv(rows, out)
-            self.status_var.set(f"Exported {len(rows)-1} rows")
-            messagebox.showinfo("Export", f"Exported {len(rows)-1} rows to:\n{out}")
+            cnt = export_csv(rows, out)
+            self.status_var.set(f"Exported {cnt} rows")
+            messagebox.showinfo("Export", f"Exported {cnt} rows to:\n{out}")
             safe_log(self.log_widget, f"[ok] Exported CSV -> {out}")
         except Exception as e:
             self._show_exception("Export failed", e)
@@ -696,7 +1142,8 @@ class DataPrepApp(tk.Tk):
                 rows, db, t,
                 unique_cols=uniq,
                 empty_as_null=self.empty_as_null_var.get(),
-                mode=self.db_mode_var.get()
+                mode=self.db_mode_var.get(),
+                conn=self._db_conn(db),
             )
             self.status_var.set(f"Upserted {cnt} rows into {t} (mode={self.db_mode_var.get()})")
             messagebox.showinfo("SQLite", f"Upserted {cnt} rows into '{t}'\nDB: {db}")
@@ -704,15 +1151,44 @@ class DataPrepApp(tk.Tk):
         except Exception as e:
             self._show_exception("Upsert failed", e)
 
+    def _db_conn(self, db_path):
+        key = os.path.abspath(db_path)
+        conn = self._db_conns.get(key)
+        if conn is None:
+            conn = open_db(key)
+            self._db_conns[key] = conn
+        return conn
+
+    def _on_close(self):
+        self._close_db_conns()
+        self.destroy()
+
+    def _close_db_conns(self):
+        for conn in self._db_conns.values():
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._db_conns.clear()
+
     def _build_column_checklist(self, headers):
-        for w in list(self.cols_scroll.inner.children.values()):
-            w.destroy()
+        """Retarget pooled checkbuttons to the new headers; only grow or hide the pool."""
         self.col_vars.clear()
+        pool = self._cb_pool
         for i, h in enumerate(headers):
-            var = tk.BooleanVar(value=True)
-            cb = ttk.Checkbutton(self.cols_scroll.inner, text=h or f"(col {i})", variable=var, command=self._on_col_toggle)
-            cb.grid(row=i, column=0, sticky="w", padx=6, pady=2)
+            if i < len(pool):
+                cb, var = pool[i]
+                cb.configure(text=h or f"(col {i})")
+                var.set(True)
+                cb.grid()
+            else:
+                var = tk.BooleanVar(value=True)
+                cb = ttk.Checkbutton(self.cols_scroll.inner, text=h or f"(col {i})", variable=var, command=self._on_col_toggle)
+                cb.grid(row=i, column=0, sticky="w", padx=6, pady=2)
+                pool.append((cb, var))
             self.col_vars[h] = var
+        for cb, _ in pool[len(headers):]:
+            cb.grid_remove()
 
     def _on_col_toggle(self):
         if self.data_preview:
@@ -727,51 +1203,60 @@ class DataPrepApp(tk.Tk):
     def _selected_columns(self):
         return [h for h, v in self.col_vars.items() if v.get()]
 
+    def _schedule_filter(self):
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DEBOUNCE_MS, self._apply_filter)
+
     def _apply_filter(self):
+        self._filter_job = None
         self._render_tree(self._filtered_preview_rows(apply_filter=True))
 
     def _filtered_preview_rows(self, apply_filter=False):
         if not self.data_preview:
             return []
         sel = self._selected_columns()
-        hdr = self.data_preview[0]
-        idx = [hdr.index(c) for c in sel if c in hdr]
-        body = self.data_preview[1:]
-        rows = [sel] + [[(r[i] if i < len(r) else "") for i in idx] for r in body]
+        cols, get = column_getter(self.data_preview[0], sel)
+        body = list(map(get, islice(self.data_preview, 1, None)))
         if apply_filter:
             q = (self.filter_var.get() or "").lower().strip()
             if q:
-                flt = [rows[0]] + [r for r in rows[1:] if any((q in (v or "").lower()) for v in r)]
-                rows = flt
-        return rows
+                hay = self._preview_haystacks(cols, body)
+                body = [body[i] for i, h in enumerate(hay) if q in h]
+        return [cols] + body
+
+    def _preview_haystacks(self, cols, body):
+        """One lower-cased, \\x1f-joined string per preview row, cached per column selection."""
+        key = tuple(cols)
+        if self._preview_hay_key != key:
+            self._preview_hay = ["\x1f".join(r).lower() for r in body]
+            self._preview_hay_key = key
+        return self._preview_hay
 
     def _filtered_full_or_preview_rows(self, for_export=False, apply_filter=False):
+        """
+        Selected-column rows, header first. With for_export the source file is
+        streamed and an iterator is returned instead of a list.
+        """
         sel = self._selected_columns()
         if not sel:
             raise ValueError("No columns selected.")
         if for_export:
-            if self.data_full is None:
-                path = self.path_var.get()
-                if path.lower().endswith(".csv"):
-                    self.data_full, _ = load_csv_full(path, self.csv_enc_var.get())
-                else:
-                    tgt = self.selected_sheet_target or "worksheets/sheet1.xml"
-                    self.data_full = load_xlsx_full(path, tgt)
-                self._apply_snake_headers(self.data_full)
-            src = self.data_full
-        else:
-            src = self.data_preview
-
-        hdr = src[0]
-        idx = [hdr.index(c) for c in sel if c in hdr]
-        body = src[1:]
-        rows = [sel] + [[(r[i] if i < len(r) else "") for i in idx] for r in body]
-
-        if apply_filter:
-            q = (self.filter_var.get() or "").lower().strip()
-            if q:
-                rows = [rows[0]] + [r for r in rows[1:] if any((q in (v or "").lower()) for v in r)]
-        return rows
+            path = self.path_var.get()
+            ft = self._current_file_type()
+            if ft is not None and ft.kind == "csv":
+                rows = iter_csv_full(path, self.csv_enc_var.get(), sel)
+            else:
+                tgt = self.selected_sheet_target or "worksheets/sheet1.xml"
+                rows = iter_xlsx_full(path, tgt, sel)
+            # pull the header now so open/parse errors surface before any output is written
+            header = next(rows)
+            if apply_filter:
+                q = (self.filter_var.get() or "").lower().strip()
+                if q:
+                    rows = (r for r in rows if any((q in (v or "").lower()) for v in r))
+            return chain([header], rows)
+        return self._filtered_preview_rows(apply_filter=apply_filter)
 
     def _render_tree(self, rows):
         self._render_tree_generic(self.tree, rows)
@@ -780,19 +1265,15 @@ class DataPrepApp(tk.Tk):
         for c in tree["columns"]:
             tree.heading(c, text="")
             tree.column(c, width=100, anchor="w")
-        tree.delete(*tree.get_children())
-
         if not rows:
+            self._tree_windows[str(tree)].set_rows([], 0)
             return
         hdr = rows[0]
         tree["columns"] = [f"c{i}" for i in range(len(hdr))]
         for i, h in enumerate(hdr):
             tree.heading(f"c{i}", text=h)
             tree.column(f"c{i}", anchor="w", width=max(120, min(280, len(h)*10)))
-        for r in rows[1:]:
-            # FIX: guard against row length, not header length
-            values = [r[i] if i < len(r) else "" for i in range(len(hdr))]
-            tree.insert("", "end", values=values)
+        self._tree_windows[str(tree)].set_rows(rows[1:], len(hdr))
 
     def _update_stats(self):
         if not self.data_preview:
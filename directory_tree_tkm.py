@@ -1,5 +1,10 @@
 import os
+import re
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from types import SimpleNamespace
 import tkinter as tk
 from tkinter import ttk, filedialog
 import platform
@@ -18,6 +23,13 @@ MIDNIGHT_THEME = {
     "btn_copy_bg": "#6272a4",
     "btn_copy_fg": "#f8f8f2",
 }
+UI_TICK_MS = 16
+INSERT_BATCH = 500
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+def _keyword_pattern(keywords):
+    """One case-insensitive alternation for the exclude keywords, or None when there are none."""
+    keywords = [k for k in keywords if k]
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE) if keywords else None
 class FileManagerDashboard(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -42,6 +54,18 @@ class FileManagerDashboard(tk.Tk):
                              background=self.theme["bg_entry"],
                              foreground=self.theme["fg_entry"],
                              arrowcolor=self.theme["fg_label"])
+        self.style.configure("Treeview",
+                             background=self.theme["bg_output"],
+                             fieldbackground=self.theme["bg_output"],
+                             foreground=self.theme["fg_text"],
+                             borderwidth=0)
+        self.style.configure("Treeview.Heading",
+                             background=self.theme["bg_entry"],
+                             foreground=self.theme["fg_label"],
+                             relief=tk.FLAT)
+        self.style.map("Treeview",
+                       background=[('selected', self.theme["btn_copy_bg"])],
+                       foreground=[('selected', self.theme["fg_text"])])
         self.style.map('TSpinbox',
                        fieldbackground=[('readonly', self.theme["bg_entry"])],
                        selectbackground=[('readonly', self.theme["btn_browse_bg"])],
@@ -59,7 +83,13 @@ class FileManagerDashboard(tk.Tk):
         self._create_top_bar()
         self._create_bottom_bar()
         self._create_layout()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         self.render_tree()
+    def _on_close(self):
+        if self._walk_cancel is not None:
+            self._walk_cancel.set()
+        self._walk_executor.shutdown(wait=False)
+        self.destroy()
     def _init_string_vars(self):
         self.path_var = tk.StringVar(value=os.getcwd())
         self.depth_var = tk.IntVar(value=3)
@@ -76,6 +106,12 @@ class FileManagerDashboard(tk.Tk):
             "file_types": {}
         }
         self.plain_tree_text = ""
+        self._tree_children = {}
+        self._unpopulated = set()
+        self._hover_row = ""
+        self._stats_line_to_path = {}
+        self._walk_executor = ThreadPoolExecutor(max_workers=1)
+        self._walk_cancel = None
     def _create_top_bar(self):
         top_bar = tk.Frame(self, height=30, bg=self.theme["bg_main"])
         top_bar.pack(side='top', fill='x')
@@ -136,25 +172,36 @@ class FileManagerDashboard(tk.Tk):
         self.notebook.add(tree_tab, text='Tree View')
         tree_scroll = tk.Scrollbar(tree_tab, bg=self.theme["bg_main"], troughcolor=self.theme["bg_output"], activebackground=self.theme["fg_text"], highlightbackground=self.theme["bg_main"])
         tree_scroll.pack(side='right', fill='y')
-        self.tree_output_text = tk.Text(tree_tab, wrap='none', yscrollcommand=tree_scroll.set, bg=self.theme["bg_output"], fg=self.theme["fg_text"], insertbackground=self.theme["fg_text"], selectbackground=self.theme["btn_copy_bg"])
-        self.tree_output_text.pack(side='left', fill='both', expand=True)
-        tree_scroll.config(command=self.tree_output_text.yview)
+        self.tree_view = ttk.Treeview(tree_tab, columns=("size",), yscrollcommand=tree_scroll.set)
+        self.tree_view.heading("#0", text="Name", anchor='w')
+        self.tree_view.heading("size", text="Size", anchor='e')
+        self.tree_view.column("size", width=90, stretch=False, anchor='e')
+        self.tree_view.pack(side='left', fill='both', expand=True)
+        tree_scroll.config(command=self.tree_view.yview)
+        self.tree_view.bind("<<TreeviewOpen>>", self._on_tree_open)
+        self.tree_view.bind("<Double-1>", self._on_tree_double_click)
+        self.tree_view.bind("<Motion>", self._on_tree_motion)
+        self.tree_view.bind("<Leave>", lambda e: self._set_tree_hover(""))
         stats_tab = tk.Frame(self.notebook, bg=self.theme["bg_main"])
         self.notebook.add(stats_tab, text='Detailed Stats')
         self.detailed_stats_text = tk.Text(stats_tab, wrap='word', state='disabled', bg=self.theme["bg_output"], fg=self.theme["fg_text"], insertbackground=self.theme["fg_text"], selectbackground=self.theme["btn_copy_bg"])
         self.detailed_stats_text.pack(fill='both', expand=True, padx=10, pady=10)
-        self.tree_output_text.tag_configure("folder", foreground=self.theme["fg_label"], underline=False)
-        self.tree_output_text.tag_configure("file", font=("Segoe UI", 10), foreground=self.theme["fg_entry"])
-        self.tree_output_text.tag_configure("error", foreground="#ff5555")
-        self.tree_output_text.tag_configure("line", foreground=self.theme["btn_copy_bg"])
+        self.tree_view.tag_configure("folder", foreground=self.theme["fg_label"])
+        self.tree_view.tag_configure("file", font=("Segoe UI", 10), foreground=self.theme["fg_entry"])
+        self.tree_view.tag_configure("error", foreground="#ff5555")
         self.detailed_stats_text.tag_configure("bold", font=("Segoe UI", 10, "bold"))
+        # one shared tag and binding set; clicks resolve the path from the line number
+        self.detailed_stats_text.tag_configure("path", foreground=self.theme["fg_entry"], underline=True)
+        self.detailed_stats_text.tag_bind("path", "<Button-1>", self._on_stats_path_click)
+        self.detailed_stats_text.tag_bind("path", "<Enter>", lambda e: self.detailed_stats_text.config(cursor="hand2"))
+        self.detailed_stats_text.tag_bind("path", "<Leave>", lambda e: self.detailed_stats_text.config(cursor=""))
     def browse_folder(self):
         folder = filedialog.askdirectory()
         if folder:
             self.path_var.set(folder)
             self.render_tree()
     def render_tree(self):
-        self.stats = {
+        stats = {
             "folders": 0,
             "files": 0,
             "total_size": 0,
@@ -166,79 +213,156 @@ class FileManagerDashboard(tk.Tk):
         path = self.path_var.get().strip()
         max_depth = self.depth_var.get()
         exclude_folders = {x.strip() for x in self.exclude_folders_var.get().split(',')}
-        exclude_keywords = {x.strip().lower() for x in self.exclude_keywords_var.get().split(',')}
-        self.tree_output_text.config(state='normal')
-        self.tree_output_text.delete("1.0", tk.END)
+        exclude_pattern = _keyword_pattern(x.strip() for x in self.exclude_keywords_var.get().split(','))
+        if self._walk_cancel is not None:
+            self._walk_cancel.set()
+        self.tree_view.delete(*self.tree_view.get_children())
+        self._tree_children = {}
+        self._unpopulated = set()
         if not os.path.isdir(path):
-            error_msg = "❌ Invalid path.\n"
-            self.tree_output_text.insert(tk.END, error_msg, "error")
+            self.stats = stats
+            self.tree_view.insert("", tk.END, text="❌ Invalid path.", tags=("error",))
             self.plain_tree_text = "Invalid path.\n"
             self._show_status("Invalid path.")
-            self.tree_output_text.config(state='disabled')
             self._update_stats_display(0)
             return
-        self.plain_tree_text = f"Directory tree for: {path}\n\n"
-        self.tree_output_text.insert(tk.END, f"📁 Directory tree for: {path}\n\n", "line")
-        self.stats["folders"] += 1
-        self.stats["max_depth_path"] = (path, 0)
-        self._generate_tree_output(path, 0, max_depth, "", exclude_folders, exclude_keywords)
-        self.tree_output_text.config(state='disabled')
+        # the walk runs on a worker thread and only touches this private state
+        walk = SimpleNamespace(stats=stats, parts=[f"Directory tree for: {path}\n\n"], children={}, cancel=threading.Event())
+        self._walk_cancel = walk.cancel
+        future = self._walk_executor.submit(self._walk_worker, walk, path, max_depth, exclude_folders, exclude_pattern)
+        self._show_status("Scanning…")
+        self.after(UI_TICK_MS, self._poll_walk, walk, future, path)
+    def _walk_worker(self, walk, path, max_depth, exclude_folders, exclude_pattern):
+        walk.stats["folders"] += 1
+        walk.stats["max_depth_path"] = (path, 0)
+        self._generate_tree_output(walk, path, 0, max_depth, "", exclude_folders, exclude_pattern)
+    def _poll_walk(self, walk, future, path):
+        if walk.cancel.is_set():
+            return
+        if not future.done():
+            self.after(UI_TICK_MS, self._poll_walk, walk, future, path)
+            return
+        exc = future.exception()
+        if exc is not None:
+            self._show_status(f"Scan failed: {exc}")
+            return
+        self.stats = walk.stats
+        self.plain_tree_text = "".join(walk.parts)
+        self._tree_children = walk.children
+        self.tree_view.insert("", tk.END, iid=path, text=f"📁 {path}", open=True, tags=("folder",))
+        self._drain_root(walk, path, 0)
+    def _drain_root(self, walk, path, start):
+        """Insert the root's children INSERT_BATCH at a time so the UI keeps repainting."""
+        if walk.cancel.is_set():
+            return
+        entries = self._tree_children.get(path, [])
+        self._insert_entries(path, entries[start:start + INSERT_BATCH])
+        if start + INSERT_BATCH < len(entries):
+            self.after(UI_TICK_MS, self._drain_root, walk, path, start + INSERT_BATCH)
+            return
         elapsed = time.time() - self.stats["start_time"]
         self._update_stats_display(elapsed)
         self._show_status("Tree rendered.")
-    def _generate_tree_output(self, path, depth, max_depth, indent, exclude_folders, exclude_keywords):
-        if depth >= max_depth:
-            return
-        try:
-            items = sorted(os.listdir(path))
-        except Exception as e:
-            error_line = indent + f"❌ [Error] {e}\n"
-            self.tree_output_text.insert(tk.END, error_line, "error")
-            self.plain_tree_text += error_line.strip() + "\n"
-            return
-        for index, item in enumerate(items):
-            item_lower = item.lower()
-            if item in exclude_folders or any(k in item_lower for k in exclude_keywords):
+    def _generate_tree_output(self, walk, path, depth, max_depth, indent, exclude_folders, exclude_pattern):
+        """
+        Walk the tree for stats and the copy text; the Treeview is filled lazily
+        from walk.children. Depth-first with an explicit stack of open folders,
+        so deep trees never hit the recursion limit.
+        """
+        stats = walk.stats
+        search = exclude_pattern.search if exclude_pattern is not None else None
+        stack = []
+        frame = self._open_tree_dir(walk, path, depth, max_depth, indent)
+        if frame is not None:
+            stack.append(frame)
+        while stack:
+            depth, indent, last, entries, it = stack[-1]
+            nxt = next(it, None)
+            if nxt is None:
+                stack.pop()
+                continue
+            index, entry = nxt
+            item = entry.name
+            if item in exclude_folders or (search is not None and search(item) is not None):
                 continue
-            full_path = os.path.join(path, item)
-            prefix = "└── " if index == len(items) - 1 else "├── "
-            self.tree_output_text.insert(tk.END, indent + prefix, "line")
-            self.plain_tree_text += indent + prefix + item + "\n"
-            icon = "📁" if os.path.isdir(full_path) else "📄"
-            if os.path.isdir(full_path):
-                folder_tag = f"folder_{full_path}"
-                self.tree_output_text.insert(tk.END, icon + " " + item + "\n", ("folder", folder_tag))
-                self.tree_output_text.tag_bind(folder_tag, "<Button-1>", lambda e, p=full_path: self._open_item(p))
-                self.tree_output_text.tag_bind(folder_tag, "<Enter>", lambda e, t=folder_tag: self._on_hover(t, True))
-                self.tree_output_text.tag_bind(folder_tag, "<Leave>", lambda e, t=folder_tag: self._on_hover(t, False))
-                self.stats["folders"] += 1
-                if depth + 1 > self.stats["max_depth_path"][1]:
-                    self.stats["max_depth_path"] = (full_path, depth + 1)
-                new_indent = indent + ("    " if index == len(items) - 1 else "│   ")
-                self._generate_tree_output(full_path, depth + 1, max_depth, new_indent, exclude_folders, exclude_keywords)
+            full_path = entry.path
+            prefix = "└── " if index == last else "├── "
+            walk.parts.append(indent + prefix + item + "\n")
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                entries.append((full_path, item, "folder", None))
+                stats["folders"] += 1
+                if depth + 1 > stats["max_depth_path"][1]:
+                    stats["max_depth_path"] = (full_path, depth + 1)
+                new_indent = indent + ("    " if index == last else "│   ")
+                frame = self._open_tree_dir(walk, full_path, depth + 1, max_depth, new_indent)
+                if frame is not None:
+                    stack.append(frame)
             else:
-                file_tag = f"file_{full_path}"
-                self.tree_output_text.insert(tk.END, icon + " " + item + "\n", ("file", file_tag))
-                self.tree_output_text.tag_bind(file_tag, "<Button-1>", lambda e, p=full_path: self._open_item(p))
-                self.tree_output_text.tag_bind(file_tag, "<Enter>", lambda e, t=file_tag: self._on_hover(t, True))
-                self.tree_output_text.tag_bind(file_tag, "<Leave>", lambda e, t=file_tag: self._on_hover(t, False))
-                self.stats["files"] += 1
+                stats["files"] += 1
                 ext = os.path.splitext(item)[1].lower()
-                self.stats["file_types"][ext] = self.stats["file_types"].get(ext, 0) + 1
+                stats["file_types"][ext] = stats["file_types"].get(ext, 0) + 1
+                size = None
                 try:
-                    size = os.path.getsize(full_path)
-                    self.stats["total_size"] += size
-                    if size > self.stats["largest_file"][1]:
-                        self.stats["largest_file"] = (full_path, size)
+                    size = entry.stat().st_size
+                    stats["total_size"] += size
+                    if size > stats["largest_file"][1]:
+                        stats["largest_file"] = (full_path, size)
                 except:
                     pass
-    def _on_hover(self, tag, entering):
-        if entering:
-            self.tree_output_text.config(cursor="hand2")
-            self.tree_output_text.tag_configure(tag, underline=True)
-        else:
-            self.tree_output_text.config(cursor="")
-            self.tree_output_text.tag_configure(tag, underline=False)
+                entries.append((full_path, item, "file", size))
+    def _open_tree_dir(self, walk, path, depth, max_depth, indent):
+        """List one folder for the walk; returns its stack frame, or None when not descended into."""
+        if depth >= max_depth or walk.cancel.is_set():
+            return None
+        entries = []
+        walk.children[path] = entries
+        try:
+            with os.scandir(path) as it:
+                items = list(it)
+            items.sort(key=attrgetter("name"))
+        except Exception as e:
+            error_line = indent + f"❌ [Error] {e}\n"
+            entries.append((None, error_line.strip(), "error", None))
+            walk.parts.append(error_line.strip() + "\n")
+            return None
+        return (depth, indent, len(items) - 1, entries, enumerate(items))
+    def _insert_children(self, path):
+        self._insert_entries(path, self._tree_children.get(path, ()))
+    def _insert_entries(self, path, entries):
+        for full_path, name, kind, size in entries:
+            if kind == "error":
+                self.tree_view.insert(path, tk.END, text=name, tags=("error",))
+            elif kind == "folder":
+                self.tree_view.insert(path, tk.END, iid=full_path, text="📁 " + name, tags=("folder",))
+                if self._tree_children.get(full_path):
+                    # placeholder child so the node gets an expand arrow
+                    self.tree_view.insert(full_path, tk.END, text="…")
+                    self._unpopulated.add(full_path)
+            else:
+                size_text = self._format_size(size) if size is not None else ""
+                self.tree_view.insert(path, tk.END, iid=full_path, text="📄 " + name, values=(size_text,), tags=("file",))
+    def _on_tree_open(self, event):
+        iid = self.tree_view.focus()
+        if iid in self._unpopulated:
+            self._unpopulated.discard(iid)
+            self.tree_view.delete(*self.tree_view.get_children(iid))
+            self._insert_children(iid)
+    def _on_tree_motion(self, event):
+        self._set_tree_hover(self.tree_view.identify_row(event.y))
+    def _set_tree_hover(self, iid):
+        if iid == self._hover_row:
+            return
+        self._hover_row = iid
+        openable = iid and (self.tree_view.tag_has("file", iid) or self.tree_view.tag_has("folder", iid))
+        self.tree_view.config(cursor="hand2" if openable else "")
+    def _on_tree_double_click(self, event):
+        iid = self.tree_view.identify_row(event.y)
+        if iid and (self.tree_view.tag_has("file", iid) or self.tree_view.tag_has("folder", iid)):
+            self._open_item(iid)
     def _open_item(self, path):
         try:
             system = platform.system()
@@ -285,36 +409,30 @@ class FileManagerDashboard(tk.Tk):
         self.quick_stats_label.config(text="\n".join(quick_lines))
         self.detailed_stats_text.config(state='normal')
         self.detailed_stats_text.delete("1.0", tk.END)
-        self.detailed_stats_text.insert(tk.END, "📊 Detailed Stats\n\n")
-        self.detailed_stats_text.insert(tk.END, f"• Largest File:\n  {os.path.basename(largest_name)} ({self._format_size(largest_size)})\n", "bold")
-        self._add_clickable_path(self.detailed_stats_text, largest_name)
-        self.detailed_stats_text.insert(tk.END, f"\n\n• Deepest Folder:\n  {max_path} (depth {max_depth})\n", "bold")
-        self._add_clickable_path(self.detailed_stats_text, max_path)
-        self.detailed_stats_text.insert(tk.END, f"\n\n• Scan Time:\n  {elapsed:.2f} seconds\n", "bold")
-        self.detailed_stats_text.insert(tk.END, "\n\n• Top 5 File Types:\n", "bold")
-        for ext, count in file_types:
-            self.detailed_stats_text.insert(tk.END, f"  • {ext or '[no ext]'}: {count}\n")
+        # one insert call with (text, tags) pairs instead of a Tcl round-trip per line
+        self.detailed_stats_text.insert(
+            tk.END,
+            "📊 Detailed Stats\n\n", (),
+            f"• Largest File:\n  {os.path.basename(largest_name)} ({self._format_size(largest_size)})\n", "bold",
+            f"  {largest_name}\n", "path",
+            f"\n\n• Deepest Folder:\n  {max_path} (depth {max_depth})\n", "bold",
+            f"  {max_path}\n", "path",
+            f"\n\n• Scan Time:\n  {elapsed:.2f} seconds\n", "bold",
+            "\n\n• Top 5 File Types:\n", "bold",
+            "".join(f"  • {ext or '[no ext]'}: {count}\n" for ext, count in file_types), (),
+        )
+        starts = self.detailed_stats_text.tag_ranges("path")[::2]
+        self._stats_line_to_path = {int(str(i).split('.')[0]): p for i, p in zip(starts, (largest_name, max_path))}
         self.detailed_stats_text.config(state='disabled')
-    def _add_clickable_path(self, widget, path):
-        tag = f"path_{path}"
-        widget.insert(tk.END, f"  {path}\n", tag)
-        widget.tag_configure(tag, foreground=self.theme["fg_entry"], underline=True)
-        widget.tag_bind(tag, "<Button-1>", lambda e, p=path: self._open_item(p))
-        widget.tag_bind(tag, "<Enter>", lambda e, t=tag: self._on_hover_detailed(widget, t, True))
-        widget.tag_bind(tag, "<Leave>", lambda e, t=tag: self._on_hover_detailed(widget, t, False))
-    def _on_hover_detailed(self, widget, tag, entering):
-        if entering:
-            widget.config(cursor="hand2")
-            widget.tag_configure(tag, underline=True)
-        else:
-            widget.config(cursor="")
-            widget.tag_configure(tag, underline=False)
+    def _on_stats_path_click(self, event):
+        line = int(self.detailed_stats_text.index(f"@{event.x},{event.y}").split('.')[0])
+        path = self._stats_line_to_path.get(line)
+        if path:
+            self._open_item(path)
     def _format_size(self, size):
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size < 1024:
-                return f"{size:.1f} {unit}"
-            size /= 1024
-        return f"{size:.1f} PB"
+        # unit index straight from the bit length: 2**10 per step, capped at PB
+        i = min(max(size.bit_length() - 1, 0) // 10, len(SIZE_UNITS) - 1)
+        return f"{size / (1 << (i * 10)):.1f} {SIZE_UNITS[i]}"
 if __name__ == "__main__":
     app = FileManagerDashboard()
     app.mainloop()
@@ -1,192 +1,335 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import hashlib
 import json
+import mmap
+import os
 import re
+import sys
 import html
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from itertools import accumulate, islice
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
 # ================== Parsing Core (kept minimal) ==================
 
-LENIENT_STRING_TERMINATOR = False  # allow repairs when s:<len> doesn't match close
-WARNINGS = []
+class ParseCtx:
+    """Per-call parser state: lenient repairs flag plus collected warnings."""
+    __slots__ = ("lenient", "warnings")
 
-def _reset_warnings():
-    WARNINGS.clear()
+    def __init__(self, lenient: bool = False):
+        self.lenient = lenient  # allow repairs when s:<len> doesn't match close
+        self.warnings = []
 
-def _warn(kind: str, **data):
-    WARNINGS.append({"kind": kind, **data})
+    def warn(self, kind: str, **data):
+        self.warnings.append({"kind": kind, **data})
 
 class ParseError(Exception):
-    def __init__(self, message: str, pos: int):
+    def __init__(self, message: str, pos: int, char_pos: int | None = None):
         super().__init__(message)
         self.pos = pos
+        self.char_pos = char_pos  # filled in by php_unserialize_bytes on the way out
+        self.source = None  # the cleaned-up text pos points into, when cleanup changed the input
 
-def _read_until(b: bytes, i: int, delim: bytes):
+def _find_delim(b: bytes, i: int, delim: bytes) -> int:
+    """Index of the next single-byte delim; callers slice b[i:j] only when they need it."""
     j = b.find(delim, i)
     if j == -1:
         raise ParseError("Unexpected end: delimiter not found", i)
-    return b[i:j], j + len(delim)
+    return j
 
-def _parse_int(b: bytes, i: int):
-    num, i = _read_until(b, i, b';')
+# scalars are the bulk of most dumps: these inline the find instead of calling _find_delim
+def _parse_int(ctx: ParseCtx, b: bytes, i: int):
+    j = b.find(b';', i)
+    if j == -1:
+        raise ParseError("Unexpected end: delimiter not found", i)
     try:
-        return int(num), i
+        return int(b[i:j]), j + 1
     except Exception:
-        raise ParseError(f"Invalid integer: {num!r}", i)
+        raise ParseError(f"Invalid integer: {b[i:j]!r}", j + 1)
 
-def _parse_float(b: bytes, i: int):
-    num, i = _read_until(b, i, b';')
+def _parse_float(ctx: ParseCtx, b: bytes, i: int):
+    j = b.find(b';', i)
+    if j == -1:
+        raise ParseError("Unexpected end: delimiter not found", i)
     try:
-        return float(num), i
+        return float(b[i:j]), j + 1
     except Exception:
-        raise ParseError(f"Invalid float: {num!r}", i)
+        raise ParseError(f"Invalid float: {b[i:j]!r}", j + 1)
 
-def _parse_bool(b: bytes, i: int):
+def _parse_bool(ctx: ParseCtx, b: bytes, i: int):
     if b[i:i+2] not in (b'0;', b'1;'):
         raise ParseError("Invalid boolean token (expected 0; or 1;)", i)
     return (b[i:i+1] == b'1'), i + 2
 
 def _decode_bytes(sbytes: bytes) -> str:
+    if sbytes.isascii():
+        return sbytes.decode('ascii')
     try:
         return sbytes.decode('utf-8')
     except UnicodeDecodeError:
         return sbytes.decode('latin-1')
 
+MEMORYVIEW_DECODE_MIN = 4096  # below this a plain slice decodes faster
+
+def _decode_span(b: bytes, start: int, end: int) -> str:
+    """Decode b[start:end]; long spans go through a memoryview to skip the slice copy."""
+    if end - start < MEMORYVIEW_DECODE_MIN:
+        return _decode_bytes(b[start:end])
+    view = memoryview(b)[start:end]
+    try:
+        return str(view, 'utf-8')
+    except UnicodeDecodeError:
+        return str(view, 'latin-1')
+
+MAX_LOOKAHEAD = 1_000_000
+INTERN_KEY_MAX = 64
+_WS_TBL = bytes(1 if c in b' \t\r\n' else 0 for c in range(256))
+_CLOSE_TAIL = re.compile(rb'[ \t\r\n]*;')
+
 def _lenient_scan_close(b: bytes, start: int):
-    MAX_LOOKAHEAD = 1_000_000
     end_limit = min(len(b), start + MAX_LOOKAHEAD)
-    k = start
-    while True:
-        k = b.find(b'"', k, end_limit)
-        if k == -1:
-            return None, None
-        j = k + 1
-        while j < len(b) and b[j] in b' \t\r\n':
-            j += 1
-        if j < len(b) and b[j:j+1] == b';':
-            sbytes = b[start:k]
-            return sbytes, j + 1
-        k += 1
-
-def _parse_string(b: bytes, i: int):
-    global LENIENT_STRING_TERMINATOR
-    strlen_bytes, i = _read_until(b, i, b':')
+    find, tail = b.find, _CLOSE_TAIL.match
+    k = find(b'"', start, end_limit)
+    while k != -1:
+        m = tail(b, k + 1)
+        if m:
+            return b[start:k], m.end()
+        k = find(b'"', k + 1, end_limit)
+    return None, None
+
+def _parse_string(ctx: ParseCtx, b: bytes, i: int):
+    j = _find_delim(b, i, b':')
     try:
-        strlen = int(strlen_bytes)
+        strlen = int(b[i:j])
     except Exception:
-        raise ParseError(f"Invalid string length: {strlen_bytes!r}", i)
+        raise ParseError(f"Invalid string length: {b[i:j]!r}", j + 1)
+    i = j + 1
     if b[i:i+1] != b'"':
         raise ParseError('Expected opening quote for string', i)
     i += 1
     start = i
     end_expected = start + strlen
+    # well-formed s:<len>:"...";  needs no whitespace scan or repair checks
+    if b[end_expected:end_expected+2] == b'";':
+        if strlen < MEMORYVIEW_DECODE_MIN:
+            return _decode_bytes(b[start:end_expected]), end_expected + 2
+        return _decode_span(b, start, end_expected), end_expected + 2
     if len(b) - start < strlen:
-        if not LENIENT_STRING_TERMINATOR:
+        if not ctx.lenient:
             raise ParseError('String length mismatch vs s:<len> (too short)', i)
         sbytes, i_new = _lenient_scan_close(b, start)
         if sbytes is None:
             raise ParseError('String length mismatch and no viable closing found', i)
-        _warn("string_length_repair_short", at_byte=start, declared_length=int(strlen), actual_length=int(len(sbytes)))
+        ctx.warn("string_length_repair_short", at_byte=start, declared_length=int(strlen), actual_length=int(len(sbytes)))
         return _decode_bytes(sbytes), i_new
-    sbytes = b[start:end_expected]
     i = end_expected
     if b[i:i+1] == b'"':
         i += 1
-        while i < len(b) and b[i] in b' \t\r\n':
+        n = len(b)
+        while i < n and _WS_TBL[b[i]]:
             i += 1
         if b[i:i+1] == b';':
             i += 1
-            return _decode_bytes(sbytes), i
-    if LENIENT_STRING_TERMINATOR:
+            return _decode_span(b, start, end_expected), i
+    if ctx.lenient:
         sbytes2, i_new = _lenient_scan_close(b, start)
         if sbytes2 is None:
             raise ParseError('Expected closing "\";" for string', i)
         if len(sbytes2) != strlen:
-            _warn("string_length_repair_mismatch", at_byte=start, declared_length=int(strlen), actual_length=int(len(sbytes2)))
+            ctx.warn("string_length_repair_mismatch", at_byte=start, declared_length=int(strlen), actual_length=int(len(sbytes2)))
         return _decode_bytes(sbytes2), i_new
     raise ParseError('Expected closing "\";" for string', i)
 
-def _parse_key(b: bytes, i: int):
+def _parse_key(ctx: ParseCtx, b: bytes, i: int):
     t = b[i:i+2]
     if t == b'i:':
-        return _parse_int(b, i+2)
+        return _parse_int(ctx, b, i+2)
     elif t == b's:':
-        return _parse_string(b, i+2)
+        key, i = _parse_string(ctx, b, i+2)
+        if len(key) < INTERN_KEY_MAX:
+            key = sys.intern(key)  # repeated row keys share one str
+        return key, i
     else:
         raise ParseError(f'Unsupported key type: {t!r}', i)
 
-def _parse_value(b: bytes, i: int):
+_SCALAR_PARSERS = {
+    b's:': _parse_string,
+    b'i:': _parse_int,
+    b'd:': _parse_float,
+    b'b:': _parse_bool,
+}
+
+def _parse_value(ctx: ParseCtx, b: bytes, i: int):
     t = b[i:i+2]
-    if t == b's:':
-        return _parse_string(b, i+2)
-    if t == b'i:':
-        return _parse_int(b, i+2)
-    if t == b'd:':
-        return _parse_float(b, i+2)
-    if t == b'b:':
-        return _parse_bool(b, i+2)
-    if b[i:i+2] == b'N;':
+    parse = _SCALAR_PARSERS.get(t)
+    if parse is not None:
+        return parse(ctx, b, i+2)
+    if t == b'N;':
         return None, i + 2
     if t == b'a:':
         i += 2
-        count_bytes, i = _read_until(b, i, b':')
+        j = _find_delim(b, i, b':')
         try:
-            count = int(count_bytes)
+            count = int(b[i:j])
         except Exception:
-            raise ParseError(f"Invalid array count: {count_bytes!r}", i)
+            raise ParseError(f"Invalid array count: {b[i:j]!r}", j + 1)
+        i = j + 1
         if b[i:i+1] != b'{':
             raise ParseError('Expected "{" after array length', i)
         i += 1
+        # Stay a list while keys run 0..n-1; switch to a dict on the first gap.
         items = []
+        d = None
         for _ in range(count):
-            k, i = _parse_key(b, i)
-            v, i = _parse_value(b, i)
-            items.append((k, v))
+            k, i = _parse_key(ctx, b, i)
+            v, i = _parse_value(ctx, b, i)
+            if d is None:
+                if type(k) is int and k == len(items):
+                    items.append(v)
+                    continue
+                d = dict(enumerate(items))
+            d[k] = v
         if b[i:i+1] != b'}':
             raise ParseError('Expected "}" to close array', i)
         i += 1
-        keys = [k for k, _ in items]
-        if keys and all(isinstance(k, int) for k in keys) and keys == list(range(len(keys))):
-            return [v for _, v in items], i
-        else:
-            d = {}
-            for k, v in items:
-                d[k] = v
-            return d, i
+        if d is None:
+            return (items if items else {}), i
+        return d, i
     raise ParseError(f'Unsupported value type: {b[i:i+10]!r}', i)
 
-def php_unserialize(serialized: str):
-    _reset_warnings()
-    b = serialized.encode('utf-8', errors='surrogatepass')
-    val, pos = _parse_value(b, 0)
+def _chars_before(b, pos: int) -> int:
+    """Whole characters in b[:pos], decoded the way _text_to_bytes encoded them."""
+    pos = max(0, min(pos, len(b)))
+    # a multi-byte character cut by pos doesn't count: drop its leading bytes
+    for k in range(pos - 1, max(-1, pos - 4), -1):
+        c = b[k]
+        if c < 0x80:
+            break
+        if c >= 0xC0:
+            if pos - k < (2 if c < 0xE0 else 3 if c < 0xF0 else 4):
+                pos = k
+            break
+    return len(str(memoryview(b)[:pos], 'utf-8', 'surrogateescape'))
+
+def php_unserialize_bytes(b, *, lenient: bool = False):
+    """Parse a bytes-like buffer (bytes or mmap); returns (value, warnings)."""
+    ctx = ParseCtx(lenient)
+    try:
+        val, pos = _parse_value(ctx, b, 0)
+    except ParseError as pe:
+        # only the failing call pays for the char offset; the parse loop never tracks it
+        if pe.char_pos is None:
+            pe.char_pos = _chars_before(b, pe.pos)
+        raise
     if b[pos:].strip():
-        _warn("trailing_data", at_byte=pos, bytes_remaining=int(len(b) - pos))
-    return val
+        ctx.warn("trailing_data", at_byte=pos, bytes_remaining=int(len(b) - pos))
+    return val, ctx.warnings
+
+def _text_to_bytes(s: str) -> bytes:
+    # surrogateescape restores bytes that came from a surrogateescape decode
+    try:
+        return s.encode('utf-8', errors='surrogateescape')
+    except UnicodeEncodeError:
+        return s.encode('utf-8', errors='surrogatepass')
+
+def php_unserialize(serialized: str, *, lenient: bool = False):
+    """Parse a PHP serialized string; returns (value, warnings)."""
+    return php_unserialize_bytes(_text_to_bytes(serialized), lenient=lenient)
+
+def php_unserialize_file(path: str, *, lenient: bool = False):
+    """Parse a serialized file through mmap instead of reading it into a str first."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return php_unserialize_bytes(b'', lenient=lenient)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return php_unserialize_bytes(mm, lenient=lenient)
 
 # ================== Cleanup & JSON extraction helpers ==================
 
-_STRING_TOKEN = re.compile(r's:(\d+):"((?:\\.|[^"\\])*)";', re.S)
+# unrolled body: one char class per run instead of an alternation per char
+_STRING_TOKEN = re.compile(r's:(\d+):"([^"\\]*(?:\\.[^"\\]*)*)";', re.S)
+# whitespace around ; : { } is dropped, other blank runs collapse to one space
+_SHELL_CLEAN = re.compile(r'\s*([;:{}])\s*|[ \t\f\v]+')
+_RE_BIDI = re.compile(r'[\u200b-\u200f\u202a-\u202e]')
+_RE_JSON_KEY_SQ = re.compile(r"(?<!\\)'([A-Za-z0-9_\-]+)'\s*:")
+_RE_JSON_VAL_SQ = re.compile(r':\s*\'([^\'\\]*(?:\\.[^\'\\]*)*)\'')
+_RE_TRAIL_COMMA = re.compile(r',\s*([}\]])')
+_BRACKET_OPEN = re.compile(r'[{\[]')
+_BRACKET_PAIRS = {'{': '}', '[': ']'}
+
+def _clean_shell(shell: str) -> str:
+    if '&' in shell:
+        shell = html.unescape(shell)
+    return _SHELL_CLEAN.sub(_shell_repl, shell)
+
+def _shell_repl(m: re.Match) -> str:
+    return m.group(1) or ' '
+
+_STRING_HEAD = re.compile(r's:(\d+):"')
+
+def _string_token_end(s: str, i: int) -> int | None:
+    """End of the s:<len>:"..."; token at i, found by jumping <len> UTF-8 bytes."""
+    m = _STRING_HEAD.match(s, i)
+    if not m:
+        return None
+    length = int(m.group(1))
+    q = m.end()
+    chunk = s[q:q+length]
+    if chunk.isascii():
+        if len(chunk) != length:
+            return None
+        end = q + length
+    else:
+        raw = chunk.encode('utf-8', errors='surrogatepass')
+        if len(raw) < length:
+            return None
+        try:
+            end = q + len(raw[:length].decode('utf-8', errors='surrogatepass'))
+        except UnicodeDecodeError:
+            return None
+    return end + 2 if s.startswith('";', end) else None
+
+def _iter_string_tokens(s: str):
+    """Yield (start, end) of each s:<len> token; the regex only covers malformed lengths."""
+    i = s.find('s:')
+    while i != -1:
+        end = _string_token_end(s, i)
+        if end is None:
+            m = _STRING_TOKEN.match(s, i)
+            end = m.end() if m else None
+        if end is None:
+            i = s.find('s:', i + 1)
+        else:
+            yield i, end
+            i = s.find('s:', end)
 
 def safe_cleanup_shell_only(s: str) -> str:
     """
     Preserve s:<len> strings; clean the shell (entities, spacing, obvious separators).
     """
-    saved = []
-    def _stash(m: re.Match) -> str:
-        saved.append(m.group(0))
-        return f'@@S{len(saved)-1}@@'
-    shell = _STRING_TOKEN.sub(_stash, s)
-    shell = html.unescape(shell)
-    shell = re.sub(r'[ \t\f\v]+', ' ', shell)
-    shell = re.sub(r'\s*;\s*', ';', shell)
-    shell = re.sub(r'\s*:\s*', ':', shell)
-    shell = re.sub(r'\s*\{\s*', '{', shell)
-    shell = re.sub(r'\s*\}\s*', '}', shell)
-    for idx, tok in enumerate(saved):
-        shell = shell.replace(f'@@S{idx}@@', tok)
-    return shell
+    parts = []
+    last = 0
+    for start, end in _iter_string_tokens(s):
+        parts.append(_clean_shell(s[last:start]))
+        parts.append(s[start:end])
+        last = end
+    parts.append(_clean_shell(s[last:]))
+    return "".join(parts)
 
 # --- Leading junk stripper to fix "Expecting value: line 1 column 1" ---
 LEAD_NOISE = re.compile(r'(?s)\A(?:\ufeff|[\x00-\x1F\x7F]+|[^\{\[]+)*(?=(\{|\[))')
@@ -202,38 +345,39 @@ def tidy_text_and_find_json(s: str) -> str | None:
     Returns a JSON string if found, else None.
     """
     s = s.strip().replace("\r\n", "\n").replace("\r", "\n")
-    s = html.unescape(s)
-    s = re.sub(r'[\u200b-\u200f\u202a-\u202e]', '', s)
+    if '&' in s:
+        s = html.unescape(s)
+    s = _RE_BIDI.sub('', s)
     s = strip_leading_noise(s)
 
-    def _try_blocks(open_ch: str, close_ch: str):
-        starts = [m.start() for m in re.finditer(re.escape(open_ch), s)]
-        for start in starts:
-            depth = 0
-            for i in range(start, len(s)):
-                c = s[i]
-                if c == open_ch:
-                    depth += 1
-                elif c == close_ch:
-                    depth -= 1
-                    if depth == 0:
-                        candidate = s[start:i+1]
-                        try:
-                            obj = json.loads(candidate)
-                            return json.dumps(obj, ensure_ascii=False)
-                        except Exception:
-                            repaired = _loose_json_fixes(candidate)
-                            if repaired is not None:
-                                return repaired
-                        break
+    def _try_block(start: int):
+        open_ch = s[start]
+        close_ch = _BRACKET_PAIRS[open_ch]
+        depth = 1
+        i = start + 1
+        close = s.find(close_ch, i)
+        while close != -1:
+            nxt = s.find(open_ch, i, close)
+            if nxt != -1:
+                depth += 1
+                i = nxt + 1
+                continue
+            depth -= 1
+            if depth == 0:
+                candidate = s[start:close+1]
+                try:
+                    obj = json.loads(candidate)
+                    return json.dumps(obj, ensure_ascii=False)
+                except Exception:
+                    return _loose_json_fixes(candidate)
+            i = close + 1
+            close = s.find(close_ch, i)
         return None
 
-    j = _try_blocks('{', '}')
-    if j is not None:
-        return j
-    j = _try_blocks('[', ']')
-    if j is not None:
-        return j
+    for m in _BRACKET_OPEN.finditer(s):
+        j = _try_block(m.start())
+        if j is not None:
+            return j
     return None
 
 def _loose_json_fixes(txt: str) -> str | None:
@@ -243,16 +387,159 @@ def _loose_json_fixes(txt: str) -> str | None:
     """
     t = txt
     # keys: 'key': -> "key":
-    t = re.sub(r"(?<!\\)'([A-Za-z0-9_\-]+)'\s*:", r'"\1":', t)
+    t = _RE_JSON_KEY_SQ.sub(r'"\1":', t)
     # string values: : 'value'
-    t = re.sub(r':\s*\'([^\'\\]*(?:\\.[^\'\\]*)*)\'', lambda m: ': "' + m.group(1).replace('"', '\\"') + '"', t)
+    t = _RE_JSON_VAL_SQ.sub(lambda m: ': "' + m.group(1).replace('"', '\\"') + '"', t)
     # trailing commas before } or ]
-    t = re.sub(r',\s*([}\]])', r'\1', t)
+    t = _RE_TRAIL_COMMA.sub(r'\1', t)
     try:
         return json.dumps(json.loads(t), ensure_ascii=False)
     except Exception:
         return None
 
+DUMPS_BATCH = 8192  # encoder chunks per join in _dumps
+
+def _orjson_renders_like_stdlib(obj) -> bool:
+    """False if obj holds a float orjson writes differently: inf/nan (as null) or an exponent."""
+    # both print the same shortest repr for 0 and for 1e-4 <= |x| < 1e16
+    stack = [obj]
+    while stack:
+        v = stack.pop()
+        t = type(v)
+        if t is float:
+            if v and not 1e-4 <= abs(v) < 1e16:
+                return False
+        elif t is dict:
+            stack.extend(v.values())
+        elif t is list or t is tuple:
+            stack.extend(v)
+    return True
+
+def _dumps(obj, indent) -> str:
+    """
+    json.dumps(obj, indent=indent, ensure_ascii=False), via orjson for the 2-space
+    layout it supports; >64-bit ints, lone surrogates and floats orjson would
+    print differently fall back to the stdlib.
+    """
+    if HAS_ORJSON and indent == 2 and _orjson_renders_like_stdlib(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            pass
+    # json.dumps joins every tiny encoder chunk at once (several times the output
+    # size); joining in batches keeps the peak near the size of the result
+    chunks = json.JSONEncoder(indent=indent, ensure_ascii=False).iterencode(obj)
+    parts = []
+    while piece := "".join(islice(chunks, DUMPS_BATCH)):
+        parts.append(piece)
+    return "".join(parts)
+
+# json.dumps(..., ensure_ascii=False) builds a new encoder per call; diagnostics reuse one
+_encode_note = json.JSONEncoder(ensure_ascii=False).encode
+
+PARSE_CACHE_SIZE = 4  # parsed trees of recent inputs; each can be as big as a multi-MB dump
+PARSE_POLL_MS = 50
+
+_PHP_HEADS = ('a:', 's:', 'i:', 'd:', 'b:', 'N;')
+_PHP_HEADS_B = tuple(h.encode() for h in _PHP_HEADS)
+
+def _looks_pristine(raw: str | bytes):
+    """'php' or 'json' when the input already looks well-formed, else None."""
+    if isinstance(raw, bytes):
+        heads, tails, jopen, jclose = _PHP_HEADS_B, (b'}', b';'), (b'{', b'['), (b'}', b']')
+    else:
+        heads, tails, jopen, jclose = _PHP_HEADS, ('}', ';'), ('{', '['), ('}', ']')
+    if raw.startswith(heads) and raw.endswith(tails):
+        return "php"
+    if raw.startswith(jopen) and raw.endswith(jclose):
+        return "json"
+    return None
+
+def _unserialize_any(raw: str | bytes, lenient: bool):
+    if isinstance(raw, bytes):
+        return php_unserialize_bytes(raw, lenient=lenient)
+    return php_unserialize(raw, lenient=lenient)
+
+# keyed by a digest, so the cache never pins the (possibly huge) input itself
+_parse_cache = OrderedDict()  # (input digest, is bytes, cleanup, lenient) -> (kind, obj, warnings)
+_parse_cache_lock = threading.Lock()  # filled on the worker, cleared from the UI
+
+def _parse_cached(raw: str | bytes, cleanup: bool, lenient: bool):
+    """
+    Parse once per (input, cleanup, lenient); returns (kind, obj, warnings) where
+    kind is "embedded", "php" or "json". Re-rendering with new indent skips this.
+    raw is the input box text, or the untouched bytes of an opened file.
+    """
+    data = raw.encode("utf-8", errors="surrogatepass") if isinstance(raw, str) else raw
+    key = (hashlib.blake2b(data, digest_size=16).digest(), isinstance(raw, bytes), cleanup, lenient)
+    with _parse_cache_lock:
+        hit = _parse_cache.get(key)
+        if hit is not None:
+            _parse_cache.move_to_end(key)
+            return hit
+    result = _parse_input(raw, cleanup, lenient)
+    with _parse_cache_lock:
+        _parse_cache[key] = result
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return result
+
+def _reset_parse_cache():
+    with _parse_cache_lock:
+        _parse_cache.clear()
+
+def _replace_escapes(s: str) -> str:
+    """Undecodable bytes kept by surrogateescape become U+FFFD, as errors="replace" would."""
+    return s.encode('utf-8', errors='surrogateescape').decode('utf-8', errors='replace')
+
+def _parse_input(raw: str | bytes, cleanup: bool, lenient: bool):
+    source = None
+    from_bytes = isinstance(raw, bytes)
+    if cleanup:
+        # well-formed input skips the cleanup passes; they only run if this fails
+        try:
+            shape = _looks_pristine(raw)
+            if shape == "php":
+                obj, warnings = _unserialize_any(raw, lenient)
+                return "php", obj, tuple(warnings)
+            if shape == "json":
+                return "embedded", json.loads(raw), ()
+        except (ParseError, ValueError):
+            pass
+        if from_bytes:
+            # byte-exact for the PHP parser (s:<len> counts bytes); JSON gets U+FFFD below
+            raw = raw.decode('utf-8', errors='surrogateescape')
+        cleaned = safe_cleanup_shell_only(raw)
+        if cleaned != raw:
+            source = raw = cleaned
+        j = tidy_text_and_find_json(_replace_escapes(raw) if from_bytes else raw)
+        if j is not None:
+            return "embedded", json.loads(j), ()
+    try:
+        obj, warnings = _unserialize_any(raw, lenient)
+        return "php", obj, tuple(warnings)
+    except ParseError as pe:
+        if isinstance(raw, bytes):
+            raw = raw.decode('utf-8', errors='replace')
+        elif from_bytes:
+            raw = _replace_escapes(raw)
+        try:
+            return "json", json.loads(strip_leading_noise(raw)), ()
+        except ValueError:
+            # not JSON either: report where the PHP parse stopped
+            pe.source = source
+            raise pe from None
+
+def _convert(raw: str | bytes, cleanup: bool, lenient: bool, indent: int):
+    """Worker job for Convert: parse (cached) and format; returns (kind, text, warnings)."""
+    kind, obj, warnings = _parse_cached(raw, cleanup, lenient)
+    return kind, _dumps(obj, (indent or 2) if kind == "json" else indent), warnings
+
+def _convert_file(path: str, lenient: bool, indent: int):
+    """Worker job for Parse File; returns (text, warnings)."""
+    obj, warnings = php_unserialize_file(path, lenient=lenient)
+    return _dumps(obj, indent), warnings
+
 # ============================= UI Application =============================
 
 APP_TITLE = "PHP Serialized → JSON"
@@ -290,6 +577,102 @@ LIGHT = {
     "info": "#0369a1",
 }
 
+HIGHLIGHT_MAX_CHARS = 200_000
+HIGHLIGHT_DEBOUNCE_MS = 80
+HIGHLIGHT_CONTEXT_LINES = 2  # retagged around an edit, in case a token spans lines
+HIGHLIGHT_CACHE_SIZE = 8  # tag ranges of recent full renders, replayed on a repeat
+
+HL_TAGS = ("key", "string", "number", "boolean", "null")
+_HL_START = re.compile(r'["\-\dtfn]')
+_HL_NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_HL_COLON = re.compile(r'\s*:')
+_HL_WORDS = {"t": ("true", "boolean"), "f": ("false", "boolean"), "n": ("null", "null")}
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+def _breaks_on_newline(s: str, start: int, close: int) -> bool:
+    pos = s.find("\\\n", start + 1, close)
+    while pos >= 0:
+        back = pos
+        while back > start and s[back] == "\\":
+            back -= 1
+        if (pos - back) % 2 == 1:
+            return True
+        pos = s.find("\\\n", pos + 2, close)
+    return False
+
+def _scan_json_tokens(s: str):
+    """Yield (tag, start, end) for each highlightable token, left to right in O(n).
+
+    Strings are closed with str.find plus a backslash-parity check instead of a
+    backtracking regex, so an unterminated quote costs one scan, not one per quote.
+    """
+    n = len(s)
+    find, search = s.find, _HL_START.search
+    strings_closed = True  # False once a quote was found with no closing partner
+    # an escaping backslash before a raw newline never closed a string in the
+    # old regex ("." skips \n); only look for it when the text has one
+    escaped_newlines = "\\\n" in s
+    m = search(s)
+    while m:
+        i = m.start()
+        c = s[i]
+        end = i + 1
+        if c == '"':
+            j = i + 1
+            while strings_closed:
+                k = find('"', j)
+                if k < 0:
+                    strings_closed = False
+                    break
+                back = k - 1
+                while back > i and s[back] == "\\":
+                    back -= 1
+                if (k - 1 - back) % 2 == 0:
+                    if escaped_newlines and _breaks_on_newline(s, i, k):
+                        break
+                    end = k + 1
+                    yield ("key" if _HL_COLON.match(s, end) else "string"), i, end
+                    break
+                j = k + 1
+        elif c in _HL_WORDS:
+            word, tag = _HL_WORDS[c]
+            if (s.startswith(word, i) and (i == 0 or not _is_word(s[i - 1]))
+                    and (i + len(word) == n or not _is_word(s[i + len(word)]))):
+                end = i + len(word)
+                yield tag, i, end
+        else:
+            num = _HL_NUMBER.match(s, i)
+            if num:
+                end = num.end()
+                yield "number", i, end
+        m = search(s, end)
+
+def _json_tag_ranges(json_str: str, first_line: int = 1):
+    """{tag: [start, end, start, end, ...]} as "line.col" indices, ready for tag_add."""
+    # "line.col" indices resolve directly; "1.0+Nc" makes Tk count from the top
+    line_starts = [0]
+    line_starts.extend(accumulate(len(line) + 1 for line in json_str.split("\n")))
+
+    # tokens arrive in order and rarely cross a newline: keep a line cursor
+    # and only bisect (from the cursor on) when a token leaves the line
+    line, line_start, next_start = 1, 0, line_starts[1]
+    shift = first_line - 1
+
+    ranges = {tag: [] for tag in HL_TAGS}
+    for tag, start, end in _scan_json_tokens(json_str):
+        if start >= next_start:
+            line = bisect_right(line_starts, start, line)
+            line_start, next_start = line_starts[line - 1], line_starts[line]
+        row = line + shift
+        if end < next_start:
+            ranges[tag] += (f"{row}.{start - line_start}", f"{row}.{end - line_start}")
+        else:
+            end_line = bisect_right(line_starts, end, line)
+            ranges[tag] += (f"{row}.{start - line_start}", f"{end_line + shift}.{end - line_starts[end_line - 1]}")
+    return ranges
+
 try:
     TtkSpinbox = ttk.Spinbox
     HAS_TTK_SPINBOX = True
@@ -318,6 +701,19 @@ class PhpToJsonApp(tk.Tk):
         self.profile_var = tk.StringVar(value="")
         self._profiles = self._load_profiles()
 
+        # parsing runs off the Tk thread; only the latest job's result is shown
+        self._exec = ThreadPoolExecutor(max_workers=1)
+        self._pending = None
+        # bytes of the last opened file, parsed directly while the input is unedited
+        self._raw_bytes = None
+        self._last_highlight_sig = None
+        self._hl_job = None  # pending re-highlight after output edits
+        self._hl_dirty = None  # (first, last) output lines edited since the last pass
+        self._last_output = None  # text last printed to the output box, until it is edited
+        self._hl_lines = 1  # output line count at the last pass
+        self._hl_cache = OrderedDict()  # (len, hash) of rendered JSON -> tag ranges
+        self._utf8_cache = None  # (text, cumulative byte offsets) for error positions
+
         self.style = ttk.Style(self)
         self.colors = {}
         self._apply_theme(dark=True)
@@ -337,6 +733,11 @@ class PhpToJsonApp(tk.Tk):
     def _apply_theme(self, *, dark: bool):
         scheme = PALETTE if dark else LIGHT
         self.colors.update(scheme)
+        # status setters carry the scheme's colours; rebuilt whenever the theme changes
+        self.set_status_ok = partial(self.set_status, color=scheme["success"])
+        self.set_status_error = partial(self.set_status, color=scheme["error"])
+        self.set_status_warn = partial(self.set_status, color=scheme["warn"])
+        self.set_status_info = partial(self.set_status, color=scheme["info"])
         self.configure(bg=scheme["bg"])
         style = self.style
         style.theme_use("clam")
@@ -370,6 +771,7 @@ class PhpToJsonApp(tk.Tk):
 
         file_menu = tk.Menu(menubar, tearoff=False)
         file_menu.add_command(label="Open…", command=self.on_open, accelerator="Ctrl+O")
+        file_menu.add_command(label="Parse File…", command=self.on_parse_file)
         file_menu.add_command(label="Save JSON…", command=self.on_save, accelerator="Ctrl+S")
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.destroy)
@@ -377,6 +779,7 @@ class PhpToJsonApp(tk.Tk):
 
         settings_menu = tk.Menu(menubar, tearoff=False)
         settings_menu.add_command(label="Profiles…", command=self._show_profiles_dialog)
+        settings_menu.add_command(label="Clear cache", command=self._clear_parse_cache)
         menubar.add_cascade(label="Settings", menu=settings_menu)
 
         help_menu = tk.Menu(menubar, tearoff=False)
@@ -477,6 +880,12 @@ class PhpToJsonApp(tk.Tk):
         self._refresh_text_areas()
         self._apply_wrap()
         self.input_text.tag_configure("error_here", background="#7f1d1d", foreground="#ffffff")
+        self.output_text.tag_configure("key", foreground="#7dd3fc")
+        self.output_text.tag_configure("string", foreground="#f472b6")
+        self.output_text.tag_configure("number", foreground="#facc15")
+        self.output_text.tag_configure("boolean", foreground="#34d399")
+        self.output_text.tag_configure("null", foreground="#a3a3a3")
+        self.output_text.bind("<<Modified>>", self._on_output_modified)
 
     def _bind_shortcuts(self):
         self.bind("<Control-Key-1>", lambda e: self.on_convert())
@@ -487,6 +896,10 @@ class PhpToJsonApp(tk.Tk):
         self.bind("<Control-q>",    lambda e: self.destroy())
         self.bind("<Control-p>",    lambda e: self._show_profiles_dialog())
 
+    def destroy(self):
+        self._exec.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
+
     def _about(self):
         messagebox.showinfo("About", f"{APP_TITLE}\n\nA tool to convert PHP serialized data to JSON.\n\nDeveloped in Python 3 with Tkinter by Damian Damjanovic.")
 
@@ -605,8 +1018,7 @@ class PhpToJsonApp(tk.Tk):
         for k in sorted(self._profiles.keys()):
             listbox.insert(tk.END, k)
 
-    def on_convert(self):
-        global LENIENT_STRING_TERMINATOR
+    def on_convert(self, block: bool = False):
         self.clear_error_highlight()
         self._clear_diag()
 
@@ -614,53 +1026,70 @@ class PhpToJsonApp(tk.Tk):
         if not raw:
             self.set_status_warn("Input is empty.")
             return
+        self.set_status_info("Converting…")
+        data = raw
+        if self._raw_bytes is not None and not self.input_text.edit_modified():
+            data = self._raw_bytes.strip()
+        # Tk variables are read here; the worker gets plain values and does parse + format
+        indent = self.indent_var.get() if self.pretty_var.get() else 0
+        job = partial(_convert, data, bool(self.cleanup_var.get()), bool(self.lenient_var.get()), indent)
+        self._run_parse(job, lambda fut: self._finish_convert(fut, raw), block=block)
+
+    def _run_parse(self, job, on_done, block=False):
+        """Run job() on the worker; on_done(future) is called back on the Tk thread."""
+        fut = self._exec.submit(job)
+        self._pending = fut
+        if block:
+            wait([fut])
+            self._poll_parse(fut, on_done)
+        else:
+            self.after(PARSE_POLL_MS, self._poll_parse, fut, on_done)
 
-        try:
-            if self.cleanup_var.get():
-                raw = safe_cleanup_shell_only(raw)
-                j = tidy_text_and_find_json(raw)
-                if j is not None:
-                    indent = self.indent_var.get() if self.pretty_var.get() else 0
-                    out = json.dumps(json.loads(j), indent=indent, ensure_ascii=False)
-                    self._print_output(out)
-                    self.set_status_ok("Found embedded JSON and formatted it.")
-                    return
-
-            LENIENT_STRING_TERMINATOR = bool(self.lenient_var.get())
-            indent = self.indent_var.get() if self.pretty_var.get() else 0
+    def _poll_parse(self, fut, on_done):
+        if fut is not self._pending:
+            return  # superseded by a newer convert
+        if not fut.done():
+            self.after(PARSE_POLL_MS, self._poll_parse, fut, on_done)
+            return
+        self._pending = None
+        on_done(fut)
 
-            try:
-                obj = php_unserialize(raw)
-                out = json.dumps(obj, indent=indent, ensure_ascii=False)
-                self._print_output(out)
-                self._emit_diag(WARNINGS)
-                if WARNINGS:
-                    self.set_status_ok(f"Converted with {len(WARNINGS)} note(s).")
+    def _finish_convert(self, fut, raw: str):
+        try:
+            kind, out, warnings = fut.result()
+            self._print_output(out)
+            if kind == "embedded":
+                self.set_status_ok("Found embedded JSON and formatted it.")
+            elif kind == "json":
+                self.set_status_ok("Input was JSON. Pretty-printed.")
+            else:
+                self._emit_diag(warnings)
+                if warnings:
+                    self.set_status_ok(f"Converted with {len(warnings)} note(s).")
                 else:
                     self.set_status_ok("Converted successfully.")
-                return
-            except ParseError:
-                try:
-                    obj = json.loads(strip_leading_noise(raw))
-                    out = json.dumps(obj, indent=indent or 2, ensure_ascii=False)
-                    self._print_output(out)
-                    self.set_status_ok("Input was JSON. Pretty-printed.")
-                    return
-                except Exception:
-                    raise
-
         except ParseError as pe:
-            context = self._context_around_byte(raw, pe.pos)
+            # after cleanup the position is in the cleaned text, which the input box doesn't show
+            text = pe.source if pe.source is not None else raw
+            context = self._context_around_byte(text, pe.pos, char_pos=pe.char_pos)
             diag = {"error": str(pe), "byte_pos": pe.pos, "context": context}
+            if pe.source is not None:
+                diag["note"] = "position refers to the input after cleanup"
             self._print_output(json.dumps(diag, indent=2, ensure_ascii=False))
-            self._highlight_error_at_byte(pe.pos, raw)
+            if pe.source is None:
+                self._highlight_error_at_byte(pe.pos, raw, char_pos=pe.char_pos)
             self.set_status_error(f"Parse error at byte {pe.pos}")
         except Exception as e:
             self._print_output(json.dumps({"error": str(e)}, indent=2, ensure_ascii=False))
             self.set_status_error(f"Error: {e}")
 
+    def _clear_parse_cache(self):
+        _reset_parse_cache()
+        self.set_status_info("Parse cache cleared.")
+
     def _print_output(self, text: str):
         self.highlight_json(self.output_text, text)
+        self._last_output = text
 
     def on_open(self):
         path = filedialog.askopenfilename(
@@ -670,21 +1099,58 @@ class PhpToJsonApp(tk.Tk):
         if not path:
             return
         try:
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
-                content = f.read()
+            with open(path, "rb") as f:
+                data = f.read()
             self.input_text.delete("1.0", tk.END)
-            self.input_text.insert("1.0", content)
+            self.input_text.insert("1.0", data.decode("utf-8", errors="replace"))
+            self.input_text.edit_modified(False)
+            self._raw_bytes = data
             self.set_status_info(f"Loaded: {path}")
         except Exception as e:
             messagebox.showerror("Open failed", str(e))
             self.set_status_error(f"Open failed: {e}")
 
+    def on_parse_file(self):
+        """Convert a serialized file without loading it into the input box."""
+        path = filedialog.askopenfilename(
+            title="Parse file",
+            filetypes=[("Serialized files", "*.txt *.php *.data *.ser *.dump"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        self.clear_error_highlight()
+        self._clear_diag()
+        self.set_status_info(f"Parsing {os.path.basename(path)}…")
+        indent = self.indent_var.get() if self.pretty_var.get() else 0
+        job = partial(_convert_file, path, bool(self.lenient_var.get()), indent)
+        self._run_parse(job, lambda fut: self._finish_parse_file(fut, path))
+
+    def _finish_parse_file(self, fut, path: str):
+        try:
+            out, warnings = fut.result()
+            self._print_output(out)
+            self._emit_diag(warnings)
+            self.set_status_ok(f"Parsed {os.path.basename(path)}" + (f" with {len(warnings)} note(s)." if warnings else "."))
+        except ParseError as pe:
+            diag = {"error": str(pe), "byte_pos": pe.pos, "file": path}
+            self._print_output(json.dumps(diag, indent=2, ensure_ascii=False))
+            self.set_status_error(f"Parse error at byte {pe.pos}")
+        except Exception as e:
+            self._print_output(json.dumps({"error": str(e)}, indent=2, ensure_ascii=False))
+            self.set_status_error(f"Error: {e}")
+
+    def _output_data(self) -> str:
+        # the converted text as printed, skipping a full copy out of the Tk buffer
+        if self._last_output is not None:
+            return self._last_output
+        return self.output_text.get("1.0", tk.END).strip()
+
     def on_save(self):
-        data = self.output_text.get("1.0", tk.END).strip()
+        data = self._output_data()
         if not data:
             if messagebox.askyesno("No output", "Output is empty. Convert now?"):
-                self.on_convert()
-                data = self.output_text.get("1.0", tk.END).strip()
+                self.on_convert(block=True)
+                data = self._output_data()
                 if not data:
                     return
             else:
@@ -705,7 +1171,7 @@ class PhpToJsonApp(tk.Tk):
             self.set_status_error(f"Save failed: {e}")
 
     def on_copy_output(self):
-        data = self.output_text.get("1.0", tk.END).strip()
+        data = self._output_data()
         if not data:
             self.set_status_warn("Nothing to copy.")
             return
@@ -714,8 +1180,11 @@ class PhpToJsonApp(tk.Tk):
         self.set_status_ok("Output copied to clipboard.")
 
     def on_clear(self):
+        self._raw_bytes = None
+        self._hl_cache.clear()
         self.input_text.delete("1.0", tk.END)
         self.output_text.delete("1.0", tk.END)
+        self._last_output = None
         self._clear_diag()
         self.clear_error_highlight()
         self.set_status_info("Cleared.")
@@ -729,38 +1198,76 @@ class PhpToJsonApp(tk.Tk):
         self._refresh_text_areas()
 
     def highlight_json(self, text_widget, json_str):
-        for tag in text_widget.tag_names():
-            text_widget.tag_delete(tag)
-        text_widget.tag_configure("key", foreground="#7dd3fc")
-        text_widget.tag_configure("string", foreground="#f472b6")
-        text_widget.tag_configure("number", foreground="#facc15")
-        text_widget.tag_configure("boolean", foreground="#34d399")
-        text_widget.tag_configure("null", foreground="#a3a3a3")
-
-        key_pattern = r'(".*?")\s*:'
-        string_pattern = r':\s*(".*?")'
-        number_pattern = r'(:\s*)(-?\d+(\.\d+)?([eE][+-]?\d+)?)'
-        boolean_pattern = r'(:\s*)(true|false)'
-        null_pattern = r'(:\s*)null'
-
+        # same text into an unedited widget (e.g. re-convert of the same input): keep it
+        sig = (str(text_widget), len(json_str), hash(json_str))
+        if sig != self._last_highlight_sig or text_widget.edit_modified():
+            if self._hl_job is not None:
+                self.after_cancel(self._hl_job)
+                self._hl_job = None
+            self._render_json(text_widget, json_str)
+            text_widget.edit_modified(False)
+            self._hl_dirty, self._hl_lines = None, json_str.count("\n") + 1
+            self._last_highlight_sig = sig
+        if len(json_str) > HIGHLIGHT_MAX_CHARS:
+            # runs after the caller has set its own status message
+            self.after_idle(lambda: self.status.set(self.status.get() + " (highlighting skipped: large output)"))
+
+    def _render_json(self, text_widget, json_str):
         text_widget.delete("1.0", tk.END)
         text_widget.insert("1.0", json_str)
+        if len(json_str) <= HIGHLIGHT_MAX_CHARS:
+            # output seen recently (e.g. switching the indent back) replays its ranges
+            cache = self._hl_cache
+            key = (len(json_str), hash(json_str))
+            ranges = cache.get(key)
+            if ranges is None:
+                ranges = cache[key] = _json_tag_ranges(json_str)
+                if len(cache) > HIGHLIGHT_CACHE_SIZE:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(key)
+            self._apply_tag_ranges(text_widget, ranges)
 
-        for match in re.finditer(key_pattern, json_str):
-            start, end = match.span(1)
-            text_widget.tag_add("key", f"1.0+{start}c", f"1.0+{end}c")
-        for match in re.finditer(string_pattern, json_str):
-            start, end = match.span(1)
-            text_widget.tag_add("string", f"1.0+{start}c", f"1.0+{end}c")
-        for match in re.finditer(number_pattern, json_str):
-            start, end = match.span(2)
-            text_widget.tag_add("number", f"1.0+{start}c", f"1.0+{end}c")
-        for match in re.finditer(boolean_pattern, json_str):
-            start, end = match.span(2)
-            text_widget.tag_add("boolean", f"1.0+{start}c", f"1.0+{end}c")
-        for match in re.finditer(null_pattern, json_str):
-            start, end = match.span(0)
-            text_widget.tag_add("null", f"1.0+{start}c", f"1.0+{end}c")
+    def _on_output_modified(self, _event=None):
+        # <<Modified>> also fires when the flag is reset; only react to real edits
+        if not self.output_text.edit_modified():
+            return
+        self.output_text.edit_modified(False)
+        self._last_highlight_sig = None  # the widget no longer holds the rendered output
+        self._last_output = None
+        line = int(self.output_text.index("insert").partition(".")[0])
+        first, last = self._hl_dirty or (line, line)
+        self._hl_dirty = (min(first, line), max(last, line))
+        if self._hl_job is not None:
+            self.after_cancel(self._hl_job)
+        self._hl_job = self.after(HIGHLIGHT_DEBOUNCE_MS, self._rehighlight_output)
+
+    def _rehighlight_output(self):
+        # retag only the edited lines (plus context); lines pasted or deleted
+        # during the burst can shift them, so widen by the line-count change
+        self._hl_job = None
+        out = self.output_text
+        (size,) = out.count("1.0", "end-1c", "chars") or (0,)
+        if size > HIGHLIGHT_MAX_CHARS or not self._hl_dirty:
+            return
+        lines = int(out.index("end-1c").partition(".")[0])
+        (first, last), shift = self._hl_dirty, abs(lines - self._hl_lines)
+        self._hl_dirty, self._hl_lines = None, lines
+        first = max(1, first - shift - HIGHLIGHT_CONTEXT_LINES)
+        last = min(lines, last + shift + HIGHLIGHT_CONTEXT_LINES)
+        start, end = f"{first}.0", f"{last}.end"
+        for tag in HL_TAGS:
+            out.tag_remove(tag, start, end)
+        self._tag_json(out, out.get(start, end), first)
+
+    def _tag_json(self, text_widget, json_str, first_line=1):
+        self._apply_tag_ranges(text_widget, _json_tag_ranges(json_str, first_line))
+
+    def _apply_tag_ranges(self, text_widget, ranges):
+        # Tk takes any number of index pairs per "tag add": one call per tag
+        for tag, idx in ranges.items():
+            if idx:
+                text_widget.tag_add(tag, *idx)
 
     def _clear_diag(self):
         self.diag_text.configure(state="normal")
@@ -770,51 +1277,60 @@ class PhpToJsonApp(tk.Tk):
     def _emit_diag(self, notes):
         if not notes:
             return
-        self.diag_text.configure(state="normal")
-        self.diag_text.insert("1.0", "Diagnostics:\n")
+        lines = ["Diagnostics:\n"]
         for n in notes:
-            self.diag_text.insert(tk.END, f"- {n['kind']}: {json.dumps({k:v for k,v in n.items() if k!='kind'}, ensure_ascii=False)}\n")
+            details = n.copy()
+            kind = details.pop("kind")
+            lines.append(f"- {kind}: {_encode_note(details)}\n")
+        self.diag_text.configure(state="normal")
+        self.diag_text.insert("1.0", "".join(lines))
         self.diag_text.configure(state="disabled")
 
     def set_status(self, msg: str, color: str):
         self.status.set(msg)
         self.status_label.configure(foreground=color)
 
-    def set_status_ok(self, msg: str):
-        self.set_status(msg, self.colors["success"])
-
-    def set_status_error(self, msg: str):
-        self.set_status(msg, self.colors["error"])
-
-    def set_status_warn(self, msg: str):
-        self.set_status(msg, self.colors["warn"])
-
-    def set_status_info(self, msg: str):
-        self.set_status(msg, self.colors["info"])
-
     def clear_error_highlight(self):
         self.input_text.tag_remove("error_here", "1.0", tk.END)
 
-    def _highlight_error_at_byte(self, byte_pos: int, raw_text: str):
+    def _char_offsets(self, raw_text: str):
+        """Cumulative UTF-8 end offset of each char, cached per text; None when ASCII."""
+        cache = self._utf8_cache
+        if cache is None or cache[0] is not raw_text:
+            cum = None
+            if not raw_text.isascii():
+                cum = array('q', accumulate(len(c.encode("utf-8", errors="surrogatepass")) for c in raw_text))
+            cache = self._utf8_cache = (raw_text, cum)
+        return cache[1]
+
+    def _byte_to_char(self, raw_text: str, byte_pos: int) -> int:
+        """Number of whole characters in the first byte_pos UTF-8 bytes of raw_text."""
+        cum = self._char_offsets(raw_text)
+        if cum is None:
+            return min(max(0, byte_pos), len(raw_text))
+        return bisect_right(cum, byte_pos)
+
+    def _highlight_error_at_byte(self, byte_pos: int, raw_text: str, char_pos: int | None = None):
         try:
-            b = raw_text.encode("utf-8", errors="surrogatepass")
-            prefix = b[:max(0, byte_pos)]
-            prefix_txt = prefix.decode("utf-8", errors="ignore")
-            ch_index = len(prefix_txt)
-            start_idx = f"1.0+{ch_index}c"
-            end_idx = f"1.0+{ch_index+1}c"
+            ch_index = char_pos if char_pos is not None else self._byte_to_char(raw_text, byte_pos)
+            # "line.col" resolves directly; "1.0+Nc" makes Tk count from the top
+            line = raw_text.count("\n", 0, ch_index) + 1
+            col = ch_index - (raw_text.rfind("\n", 0, ch_index) + 1)
+            start_idx = f"{line}.{col}"
+            end_idx = f"{start_idx}+1c"
             self.input_text.tag_add("error_here", start_idx, end_idx)
             self.input_text.see(start_idx)
         except Exception:
             pass
 
-    def _context_around_byte(self, raw_text: str, byte_pos: int, radius: int = 24) -> str:
-        b = raw_text.encode("utf-8", errors="surrogatepass")
-        start = max(0, byte_pos - radius)
-        end = min(len(b), byte_pos + radius)
-        snippet = b[start:end].decode("utf-8", errors="replace")
-        pointer = " " * (len(b[start:byte_pos].decode("utf-8", errors="ignore"))) + "▲"
-        return f"...{snippet}...\n{pointer}"
+    def _context_around_byte(self, raw_text: str, byte_pos: int, radius: int = 24,
+                             char_pos: int | None = None) -> str:
+        ch_index = char_pos if char_pos is not None else self._byte_to_char(raw_text, byte_pos)
+        ch_index = min(ch_index, len(raw_text))
+        start = max(0, ch_index - radius)
+        end = min(len(raw_text), ch_index + radius)
+        pointer = " " * (ch_index - start) + "▲"
+        return f"...{raw_text[start:end]}...\n{pointer}"
 
     def _about(self):
         messagebox.showinfo("About", "PHP Serialized → JSON\nClean & Convert\n© 2025")
@@ -2,11 +2,22 @@
 # -*- coding: utf-8 -*-
 
 import json
+import mmap
+import os
 import re
 import html
+import hashlib
+from collections import OrderedDict
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
 # ================== Core parser (kept intact) ==================
 
 LENIENT_STRING_TERMINATOR = False
@@ -54,21 +65,19 @@ def _decode_bytes(sbytes: bytes) -> str:
     except UnicodeDecodeError:
         return sbytes.decode('latin-1')
 
+_CLOSE_TAIL = re.compile(rb'[ \t\r\n]*;')
+
 def _lenient_scan_close(b: bytes, start: int):
     MAX_LOOKAHEAD = 1_000_000
     end_limit = min(len(b), start + MAX_LOOKAHEAD)
-    k = start
-    while True:
-        k = b.find(b'"', k, end_limit)
-        if k == -1:
-            return None, None
-        j = k + 1
-        while j < len(b) and b[j] in b' \t\r\n':
-            j += 1
-        if j < len(b) and b[j:j+1] == b';':
-            sbytes = b[start:k]
-            return sbytes, j + 1
-        k += 1
+    find, tail = b.find, _CLOSE_TAIL.match
+    k = find(b'"', start, end_limit)
+    while k != -1:
+        m = tail(b, k + 1)
+        if m:
+            return b[start:k], m.end()
+        k = find(b'"', k + 1, end_limit)
+    return None, None
 
 def _parse_string(b: bytes, i: int):
     global LENIENT_STRING_TERMINATOR
@@ -108,26 +117,31 @@ def _parse_string(b: bytes, i: int):
         return _decode_bytes(sbytes2), i_new
     raise ParseError('Expected closing "\";" for string', i)
 
+_KEY_PARSERS = {
+    b'i:': _parse_int,
+    b's:': _parse_string,
+}
+
 def _parse_key(b: bytes, i: int):
     t = b[i:i+2]
-    if t == b'i:':
-        return _parse_int(b, i+2)
-    elif t == b's:':
-        return _parse_string(b, i+2)
-    else:
+    parse = _KEY_PARSERS.get(t)
+    if parse is None:
         raise ParseError(f'Unsupported key type: {t!r}', i)
+    return parse(b, i+2)
+
+_SCALAR_PARSERS = {
+    b's:': _parse_string,
+    b'i:': _parse_int,
+    b'd:': _parse_float,
+    b'b:': _parse_bool,
+}
 
 def _parse_value(b: bytes, i: int):
     t = b[i:i+2]
-    if t == b's:':
-        return _parse_string(b, i+2)
-    if t == b'i:':
-        return _parse_int(b, i+2)
-    if t == b'd:':
-        return _parse_float(b, i+2)
-    if t == b'b:':
-        return _parse_bool(b, i+2)
-    if b[i:i+2] == b'N;':
+    parse = _SCALAR_PARSERS.get(t)
+    if parse is not None:
+        return parse(b, i+2)
+    if t == b'N;':
         return None, i + 2
     if t == b'a:':
         i += 2
@@ -139,51 +153,73 @@ def _parse_value(b: bytes, i: int):
         if b[i:i+1] != b'{':
             raise ParseError('Expected "{" after array length', i)
         i += 1
+        # Stay a list while keys run 0..n-1; switch to a dict on the first gap.
         items = []
+        d = None
         for _ in range(count):
             k, i = _parse_key(b, i)
             v, i = _parse_value(b, i)
-            items.append((k, v))
+            if d is None:
+                if type(k) is int and k == len(items):
+                    items.append(v)
+                    continue
+                d = dict(enumerate(items))
+            d[k] = v
         if b[i:i+1] != b'}':
             raise ParseError('Expected "}" to close array', i)
         i += 1
-        keys = [k for k, _ in items]
-        if keys and all(isinstance(k, int) for k in keys) and keys == list(range(len(keys))):
-            return [v for _, v in items], i
-        else:
-            d = {}
-            for k, v in items:
-                d[k] = v
-            return d, i
+        if d is None:
+            return (items if items else {}), i
+        return d, i
     raise ParseError(f'Unsupported value type: {b[i:i+10]!r}', i)
 
-def php_unserialize(serialized: str):
+def php_unserialize_bytes(b):
+    """Parse a bytes-like buffer (bytes or mmap)."""
     _reset_warnings()
-    b = serialized.encode('utf-8', errors='surrogatepass')
     val, pos = _parse_value(b, 0)
     if b[pos:].strip():
         _warn("trailing_data", at_byte=pos, bytes_remaining=int(len(b) - pos))
     return val
 
+def php_unserialize(serialized: str):
+    return php_unserialize_bytes(serialized.encode('utf-8', errors='surrogatepass'))
+
+def php_unserialize_file(path: str):
+    """Parse a serialized file through mmap instead of reading it into a str first."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return php_unserialize_bytes(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return php_unserialize_bytes(mm)
+
 # ================== Cleanup & JSON extraction ==================
 
-_STRING_TOKEN = re.compile(r's:(\d+):"((?:\\.|[^"\\])*)";', re.S)
+# unrolled body: one char class per run instead of an alternation per char
+_STRING_TOKEN = re.compile(r's:(\d+):"([^"\\]*(?:\\.[^"\\]*)*)";', re.S)
+_SHELL_CLEAN = re.compile(r'\s*([;:{}])\s*|[ \t\f\v]+')
+_RE_BIDI = re.compile(r'[\u200b-\u200f\u202a-\u202e]')
+_RE_JSON_KEY_SQ = re.compile(r"(?<!\\)'([A-Za-z0-9_\-]+)'\s*:")
+_RE_JSON_VAL_SQ = re.compile(r':\s*\'([^\'\\]*(?:\\.[^\'\\]*)*)\'')
+_RE_TRAIL_COMMA = re.compile(r',\s*([}\]])')
+_RE_OPEN = {'{': re.compile(r'\{'), '[': re.compile(r'\[')}
+
+def _shell_repl(m: re.Match) -> str:
+    return m.group(1) or ' '
+
+def _clean_shell(shell: str) -> str:
+    # one pass: separators swallow their surrounding whitespace, other runs become ' '
+    return _SHELL_CLEAN.sub(_shell_repl, html.unescape(shell))
 
 def safe_cleanup_shell_only(s: str) -> str:
-    saved = []
-    def _stash(m: re.Match) -> str:
-        saved.append(m.group(0))
-        return f'@@S{len(saved)-1}@@'
-    shell = _STRING_TOKEN.sub(_stash, s)
-    shell = html.unescape(shell)
-    shell = re.sub(r'[ \t\f\v]+', ' ', shell)
-    shell = re.sub(r'\s*;\s*', ';', shell)
-    shell = re.sub(r'\s*:\s*', ':', shell)
-    shell = re.sub(r'\s*\{\s*', '{', shell)
-    shell = re.sub(r'\s*\}\s*', '}', shell)
-    for idx, tok in enumerate(saved):
-        shell = shell.replace(f'@@S{idx}@@', tok)
-    return shell
+    # clean only the text between s:<len> tokens; tokens are copied verbatim
+    parts = []
+    last = 0
+    for m in _STRING_TOKEN.finditer(s):
+        parts.append(_clean_shell(s[last:m.start()]))
+        parts.append(m.group(0))
+        last = m.end()
+    parts.append(_clean_shell(s[last:]))
+    return "".join(parts)
 
 LEAD_NOISE = re.compile(r'(?s)\A(?:\ufeff|[\x00-\x1F\x7F]+|[^\{\[]+)*(?=(\{|\[))')
 
@@ -194,29 +230,32 @@ def strip_leading_noise(s: str) -> str:
 def tidy_text_and_find_json(s: str) -> str | None:
     s = s.strip().replace("\r\n", "\n").replace("\r", "\n")
     s = html.unescape(s)
-    s = re.sub(r'[\u200b-\u200f\u202a-\u202e]', '', s)
+    s = _RE_BIDI.sub('', s)
     s = strip_leading_noise(s)
 
     def _try_blocks(open_ch: str, close_ch: str):
-        starts = [m.start() for m in re.finditer(re.escape(open_ch), s)]
+        starts = [m.start() for m in _RE_OPEN[open_ch].finditer(s)]
         for start in starts:
+            # jump between the next open and next close with str.find
             depth = 0
-            for i in range(start, len(s)):
-                c = s[i]
-                if c == open_ch:
+            no, nc = start, s.find(close_ch, start)
+            while nc >= 0:
+                if 0 <= no < nc:
                     depth += 1
-                elif c == close_ch:
-                    depth -= 1
-                    if depth == 0:
-                        candidate = s[start:i+1]
-                        try:
-                            obj = json.loads(candidate)
-                            return json.dumps(obj, ensure_ascii=False)
-                        except Exception:
-                            repaired = _loose_json_fixes(candidate)
-                            if repaired is not None:
-                                return repaired
-                        break
+                    no = s.find(open_ch, no + 1)
+                    continue
+                depth -= 1
+                if depth == 0:
+                    candidate = s[start:nc+1]
+                    try:
+                        obj = json.loads(candidate)
+                        return json.dumps(obj, ensure_ascii=False)
+                    except Exception:
+                        repaired = _loose_json_fixes(candidate)
+                        if repaired is not None:
+                            return repaired
+                    break
+                nc = s.find(close_ch, nc + 1)
         return None
 
     j = _try_blocks('{', '}')
@@ -229,14 +268,65 @@ def tidy_text_and_find_json(s: str) -> str | None:
 
 def _loose_json_fixes(txt: str) -> str | None:
     t = txt
-    t = re.sub(r"(?<!\\)'([A-Za-z0-9_\-]+)'\s*:", r'"\1":', t)
-    t = re.sub(r':\s*\'([^\'\\]*(?:\\.[^\'\\]*)*)\'', lambda m: ': "' + m.group(1).replace('"', '\\"') + '"', t)
-    t = re.sub(r',\s*([}\]])', r'\1', t)
+    t = _RE_JSON_KEY_SQ.sub(r'"\1":', t)
+    t = _RE_JSON_VAL_SQ.sub(lambda m: ': "' + m.group(1).replace('"', '\\"') + '"', t)
+    t = _RE_TRAIL_COMMA.sub(r'\1', t)
     try:
         return json.dumps(json.loads(t), ensure_ascii=False)
     except Exception:
         return None
 
+_PHP_HEADS = ('a:', 's:', 'i:', 'd:', 'b:', 'N;')
+
+def _looks_serialized(raw: str) -> bool:
+    return raw.startswith(_PHP_HEADS) and raw.endswith(('}', ';'))
+
+PARSE_CACHE_SIZE = 4
+
+def _parse_input(raw: str, cleanup: bool):
+    """Returns (kind, obj, warnings); kind is "embedded", "php" or "json"."""
+    if cleanup:
+        # well-formed serialized input parses as-is; cleanup only runs if that fails
+        if _looks_serialized(raw):
+            try:
+                return "php", php_unserialize(raw), tuple(WARNINGS)
+            except ParseError:
+                pass
+        raw = safe_cleanup_shell_only(raw)
+        j = tidy_text_and_find_json(raw)
+        if j is not None:
+            return "embedded", json.loads(j), ()
+    try:
+        return "php", php_unserialize(raw), tuple(WARNINGS)
+    except ParseError:
+        # Try plain JSON with leading-noise strip
+        return "json", json.loads(strip_leading_noise(raw)), ()
+
+def _orjson_renders_like_stdlib(obj) -> bool:
+    """False if obj holds a float orjson writes differently: inf/nan (as null) or an exponent."""
+    # both print the same shortest repr for 0 and for 1e-4 <= |x| < 1e16
+    stack = [obj]
+    while stack:
+        v = stack.pop()
+        t = type(v)
+        if t is float:
+            if v and not 1e-4 <= abs(v) < 1e16:
+                return False
+        elif t is dict:
+            stack.extend(v.values())
+        elif t is list or t is tuple:
+            stack.extend(v)
+    return True
+
+def _dumps(obj, indent) -> str:
+    """json.dumps(obj, indent=indent, ensure_ascii=False); orjson renders the 2-space case when it agrees."""
+    if HAS_ORJSON and indent == 2 and _orjson_renders_like_stdlib(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            pass  # >64-bit ints, lone surrogates
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
+
 # ============================= UI =============================
 
 APP_TITLE = "PHP Serialized → JSON"
@@ -257,6 +347,38 @@ LIGHT = {
     "success": "#1e7e34", "error": "#b00020", "warn": "#9c6f00", "info": "#0369a1",
 }
 
+# JSON syntax highlight: one left-to-right pass; group names are the tag names
+_HL_TAGS = ("key", "string", "number", "boolean", "null")
+_RE_HL_TOKEN = re.compile(
+    r'(?P<key>"[^"\\\n]*(?:\\.[^"\\\n]*)*")(?=\s*:)'
+    r'|(?P<string>"[^"\\\n]*(?:\\.[^"\\\n]*)*")'
+    r'|(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)'
+    r'|(?P<boolean>true|false)'
+    r'|(?P<null>null)'
+)
+HIGHLIGHT_DEBOUNCE_MS = 80  # quiet time after an output edit before retagging
+HIGHLIGHT_CONTEXT_LINES = 1  # retagged around the edited lines
+
+
+def _json_tag_ranges(json_str: str, first_line: int = 1):
+    """{tag: [start, end, ...]} as "line.col" indices, ready for tag_add."""
+    # tokens never span a newline, so "line.col" comes from a running line cursor
+    # instead of "1.0+Nc" (which makes Tk count from the top for every index)
+    ranges = {tag: [] for tag in _HL_TAGS}
+    count, rfind = json_str.count, json_str.rfind
+    line, line_start, last = first_line, 0, 0
+    for m in _RE_HL_TOKEN.finditer(json_str):
+        start, end = m.span()
+        nl = count("\n", last, start)
+        if nl:
+            line += nl
+            line_start = rfind("\n", last, start) + 1
+        last = start
+        ranges[m.lastgroup] += (f"{line}.{start - line_start}", f"{line}.{end - line_start}")
+    return ranges
+
+_RE_BADGE_COUNT = re.compile(r'\((\d+)\)')
+
 try:
     TtkSpinbox = ttk.Spinbox
     HAS_TTK_SPINBOX = True
@@ -285,6 +407,14 @@ class PhpToJsonApp(tk.Tk):
         self.profile_var = tk.StringVar(value="")
         self._profiles = self._load_profiles()
 
+        self._pending_diag = []  # notes not yet written to the Diagnostics tab
+        self._parse_cache = OrderedDict()  # (input digest, cleanup, lenient) -> (kind, obj, warnings)
+        self._utf8_cache = None  # (text, its UTF-8 bytes) shared by the error helpers
+        self._hl_job = None  # pending re-highlight after output edits
+        self._hl_dirty = None  # (first, last) output lines edited since the last pass
+        self._last_output = None  # text last printed to the output box, until it is edited
+        self._hl_lines = 1
+
         # theme
         self.style = ttk.Style(self)
         self.colors = {}
@@ -334,6 +464,7 @@ class PhpToJsonApp(tk.Tk):
 
         file_menu = tk.Menu(menubar, tearoff=False)
         file_menu.add_command(label="Open…", command=self.on_open, accelerator="Ctrl+O")
+        file_menu.add_command(label="Parse File…", command=self.on_parse_file)
         file_menu.add_command(label="Save JSON…", command=self.on_save, accelerator="Ctrl+S")
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.destroy)
@@ -416,6 +547,7 @@ class PhpToJsonApp(tk.Tk):
         self.output_text.configure(yscrollcommand=out_scroll.set)
         self.output_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         out_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.output_text.bind("<<Modified>>", self._on_output_modified)
 
         # Diagnostics tab
         diag_tab = ttk.Frame(self.nb, style="Panel.TFrame")
@@ -428,6 +560,7 @@ class PhpToJsonApp(tk.Tk):
         self.diag_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         diag_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.diag_tab_index = self.nb.index("end") - 1  # last added
+        self.nb.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         # Status bar (bottom of window)
         bottom = ttk.Frame(self, style="Panel.TFrame")
@@ -440,6 +573,11 @@ class PhpToJsonApp(tk.Tk):
         self._refresh_text_areas()
         self._apply_wrap()
         self.input_text.tag_configure("error_here", background="#7f1d1d", foreground="#ffffff")
+        self.output_text.tag_configure("key", foreground="#7dd3fc")
+        self.output_text.tag_configure("string", foreground="#f472b6")
+        self.output_text.tag_configure("number", foreground="#facc15")
+        self.output_text.tag_configure("boolean", foreground="#34d399")
+        self.output_text.tag_configure("null", foreground="#a3a3a3")
 
     # ---------- Context menu (Right-click Quick Paste) ----------
     def _attach_context_menu(self, text_widget: tk.Text, *, quick_convert: bool, readonly: bool=False):
@@ -525,6 +663,7 @@ class PhpToJsonApp(tk.Tk):
         self._refresh_text_areas()
 
     def _clear_diag(self):
+        self._pending_diag.clear()
         self.diag_text.configure(state="normal")
         self.diag_text.delete("1.0", tk.END)
         self.diag_text.configure(state="disabled")
@@ -537,23 +676,40 @@ class PhpToJsonApp(tk.Tk):
     def _emit_diag(self, notes):
         if not notes:
             return
-        self.diag_text.configure(state="normal")
-        if self.diag_text.index("end-1c") == "1.0":
-            self.diag_text.insert("1.0", "Diagnostics:\n")
-        for n in notes:
-            self.diag_text.insert(tk.END, f"- {n['kind']}: {json.dumps({k:v for k,v in n.items() if k!='kind'}, ensure_ascii=False)}\n")
-        self.diag_text.configure(state="disabled")
-        self.diag_text.see(tk.END)
+        # the text is only written once the Diagnostics tab is shown
+        self._pending_diag.extend(notes)
+        if self.nb.index("current") == self.diag_tab_index:
+            self._render_pending_diag()
 
         # user feedback: badge count + status ping
         try:
             current = self.nb.tab(self.diag_tab_index, "text")
         except Exception:
             current = "Diagnostics"
-        count = int(re.search(r'\((\d+)\)', current).group(1)) + len(notes) if re.search(r'\((\d+)\)', current) else len(notes)
+        m = _RE_BADGE_COUNT.search(current)
+        count = int(m.group(1)) + len(notes) if m else len(notes)
         self.nb.tab(self.diag_tab_index, text=f"Diagnostics ({count})")
         self.set_status_info(f"Diagnostics updated: {count} note(s).")
 
+    def _render_pending_diag(self):
+        notes = self._pending_diag
+        if not notes:
+            return
+        diag = self.diag_text
+        dumps = json.dumps
+        lines = [f"- {n['kind']}: {dumps({k:v for k,v in n.items() if k!='kind'}, ensure_ascii=False)}\n" for n in notes]
+        notes.clear()
+        diag.configure(state="normal")
+        if diag.index("end-1c") == "1.0":
+            lines.insert(0, "Diagnostics:\n")
+        diag.insert(tk.END, "".join(lines))
+        diag.configure(state="disabled")
+        diag.see(tk.END)
+
+    def _on_tab_changed(self, event=None):
+        if self.nb.index("current") == self.diag_tab_index:
+            self._render_pending_diag()
+
     def set_status(self, msg: str, color: str):
         self.status.set(msg)
         self.status_label.configure(foreground=color)
@@ -573,26 +729,39 @@ class PhpToJsonApp(tk.Tk):
     def clear_error_highlight(self):
         self.input_text.tag_remove("error_here", "1.0", tk.END)
 
+    def _utf8_of(self, raw_text: str) -> bytes:
+        cache = self._utf8_cache
+        if cache is None or cache[0] is not raw_text:
+            cache = self._utf8_cache = (raw_text, raw_text.encode("utf-8", errors="surrogatepass"))
+        return cache[1]
+
     def _highlight_error_at_byte(self, byte_pos: int, raw_text: str):
         try:
-            b = raw_text.encode("utf-8", errors="surrogatepass")
-            prefix = b[:max(0, byte_pos)]
-            prefix_txt = prefix.decode("utf-8", errors="ignore")
-            ch_index = len(prefix_txt)
-            start_idx = f"1.0+{ch_index}c"
-            end_idx = f"1.0+{ch_index+1}c"
+            if raw_text.isascii():
+                ch_index = min(max(0, byte_pos), len(raw_text))
+            else:
+                # str() decodes straight from the memoryview: no copy of the prefix
+                b = self._utf8_of(raw_text)
+                ch_index = len(str(memoryview(b)[:max(0, byte_pos)], "utf-8", "ignore"))
+            # "line.col" resolves directly; "1.0+Nc" makes Tk count from the top
+            line = raw_text.count("\n", 0, ch_index) + 1
+            col = ch_index - (raw_text.rfind("\n", 0, ch_index) + 1)
+            start_idx = f"{line}.{col}"
+            end_idx = f"{start_idx}+1c"
             self.input_text.tag_add("error_here", start_idx, end_idx)
             self.input_text.see(start_idx)
         except Exception:
             pass
 
     def _context_around_byte(self, raw_text: str, byte_pos: int, radius: int = 24) -> str:
-        b = raw_text.encode("utf-8", errors="surrogatepass")
+        b = self._utf8_of(raw_text)
         start = max(0, byte_pos - radius)
         end = min(len(b), byte_pos + radius)
-        snippet = b[start:end].decode("utf-8", errors="replace")
-        pointer = " " * (len(b[start:byte_pos].decode("utf-8", errors="ignore"))) + "▲"
-        return f"...{snippet}...\n{pointer}"
+        # decode the halves separately so the pointer column is just len(head)
+        head = b[start:max(start, byte_pos)].decode("utf-8", errors="replace")
+        tail = b[max(start, byte_pos):end].decode("utf-8", errors="replace")
+        pointer = " " * len(head) + "▲"
+        return f"...{head}{tail}...\n{pointer}"
 
     # ---------- Profiles (menu dialog) ----------
     def _load_profiles(self) -> dict:
@@ -718,36 +887,22 @@ class PhpToJsonApp(tk.Tk):
             return
 
         try:
-            if self.cleanup_var.get():
-                raw = safe_cleanup_shell_only(raw)
-                j = tidy_text_and_find_json(raw)
-                if j is not None:
-                    indent = self.indent_var.get() if self.pretty_var.get() else 0
-                    out = json.dumps(json.loads(j), indent=indent, ensure_ascii=False)
-                    self._print_output(out)
-                    self.set_status_ok("Found embedded JSON and formatted it.")
-                    return
-
+            cleanup = bool(self.cleanup_var.get())
             LENIENT_STRING_TERMINATOR = bool(self.lenient_var.get())
             indent = self.indent_var.get() if self.pretty_var.get() else 0
 
-            try:
-                obj = php_unserialize(raw)
-                out = json.dumps(obj, indent=indent, ensure_ascii=False)
-                self._print_output(out)
-                self._emit_diag(WARNINGS)
-                self.set_status_ok("Converted successfully." if not WARNINGS else f"Converted with {len(WARNINGS)} note(s).")
-                return
-            except ParseError:
-                # Try plain JSON with leading-noise strip
-                try:
-                    obj = json.loads(strip_leading_noise(raw))
-                    out = json.dumps(obj, indent=indent or 2, ensure_ascii=False)
-                    self._print_output(out)
-                    self.set_status_ok("Input was JSON. Pretty-printed.")
-                    return
-                except Exception:
-                    raise
+            # only the dump depends on pretty/indent; the parse is reused while the input is unchanged
+            digest = hashlib.blake2b(raw.encode("utf-8", errors="surrogatepass"), digest_size=16).digest()
+            key = (digest, cleanup, LENIENT_STRING_TERMINATOR)
+            cache = self._parse_cache
+            parsed = cache.get(key)
+            if parsed is None:
+                parsed = cache[key] = _parse_input(raw, cleanup)
+                if len(cache) > PARSE_CACHE_SIZE:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(key)
+            self._show_parsed(*parsed, indent)
 
         except ParseError as pe:
             context = self._context_around_byte(raw, pe.pos)
@@ -759,8 +914,21 @@ class PhpToJsonApp(tk.Tk):
             self._print_output(json.dumps({"error": str(e)}, indent=2, ensure_ascii=False))
             self.set_status_error(f"Error: {e}")
 
+    def _show_parsed(self, kind: str, obj, warnings, indent: int):
+        if kind == "embedded":
+            self._print_output(_dumps(obj, indent))
+            self.set_status_ok("Found embedded JSON and formatted it.")
+        elif kind == "json":
+            self._print_output(_dumps(obj, indent or 2))
+            self.set_status_ok("Input was JSON. Pretty-printed.")
+        else:
+            self._print_output(_dumps(obj, indent))
+            self._emit_diag(warnings)
+            self.set_status_ok("Converted successfully." if not warnings else f"Converted with {len(warnings)} note(s).")
+
     def _print_output(self, text: str):
         self.highlight_json(self.output_text, text)
+        self._last_output = text
         # switch to Output tab for immediate feedback
         try:
             self.nb.select(1)  # Output tab index
@@ -785,12 +953,44 @@ class PhpToJsonApp(tk.Tk):
             messagebox.showerror("Open failed", str(e))
             self.set_status_error(f"Open failed: {e}")
 
+    def on_parse_file(self):
+        """Convert a serialized file without loading it into the input box."""
+        global LENIENT_STRING_TERMINATOR
+        path = filedialog.askopenfilename(
+            title="Parse file",
+            filetypes=[("Serialized files", "*.txt *.php *.data *.ser *.dump"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        self.clear_error_highlight()
+        self._clear_diag()
+        try:
+            LENIENT_STRING_TERMINATOR = bool(self.lenient_var.get())
+            indent = self.indent_var.get() if self.pretty_var.get() else 0
+            obj = php_unserialize_file(path)
+            self._print_output(_dumps(obj, indent))
+            self._emit_diag(WARNINGS)
+            self.set_status_ok(f"Parsed {os.path.basename(path)}" + (f" with {len(WARNINGS)} note(s)." if WARNINGS else "."))
+        except ParseError as pe:
+            diag = {"error": str(pe), "byte_pos": pe.pos, "file": path}
+            self._print_output(json.dumps(diag, indent=2, ensure_ascii=False))
+            self.set_status_error(f"Parse error at byte {pe.pos}")
+        except Exception as e:
+            self._print_output(json.dumps({"error": str(e)}, indent=2, ensure_ascii=False))
+            self.set_status_error(f"Error: {e}")
+
+    def _output_data(self) -> str:
+        # the converted text as printed, skipping a full copy out of the Tk buffer
+        if self._last_output is not None:
+            return self._last_output
+        return self.output_text.get("1.0", tk.END).strip()
+
     def on_save(self):
-        data = self.output_text.get("1.0", tk.END).strip()
+        data = self._output_data()
         if not data:
             if messagebox.askyesno("No output", "Output is empty. Convert now?"):
                 self.on_convert()
-                data = self.output_text.get("1.0", tk.END).strip()
+                data = self._output_data()
                 if not data:
                     return
             else:
@@ -811,7 +1011,7 @@ class PhpToJsonApp(tk.Tk):
             self.set_status_error(f"Save failed: {e}")
 
     def on_copy_output(self):
-        data = self.output_text.get("1.0", tk.END).strip()
+        data = self._output_data()
         if not data:
             self.set_status_warn("Nothing to copy.")
             return
@@ -822,6 +1022,7 @@ class PhpToJsonApp(tk.Tk):
     def on_clear(self):
         self.input_text.delete("1.0", tk.END)
         self.output_text.delete("1.0", tk.END)
+        self._last_output = None
         self._clear_diag()
         self.clear_error_highlight()
         self.set_status_info("Cleared.")
@@ -829,39 +1030,56 @@ class PhpToJsonApp(tk.Tk):
 
     # ---------- Syntax highlight ----------
     def highlight_json(self, text_widget, json_str):
-        for tag in text_widget.tag_names():
-            text_widget.tag_delete(tag)
-
-        text_widget.tag_configure("key", foreground="#7dd3fc")
-        text_widget.tag_configure("string", foreground="#f472b6")
-        text_widget.tag_configure("number", foreground="#facc15")
-        text_widget.tag_configure("boolean", foreground="#34d399")
-        text_widget.tag_configure("null", foreground="#a3a3a3")
-
-        key_pattern = r'(".*?")\s*:'
-        string_pattern = r':\s*(".*?")'
-        number_pattern = r'(:\s*)(-?\d+(\.\d+)?([eE][+-]?\d+)?)'
-        boolean_pattern = r'(:\s*)(true|false)'
-        null_pattern = r'(:\s*)null'
+        # tags are configured once in _build_ui; just clear their old ranges
+        for tag in _HL_TAGS:
+            text_widget.tag_remove(tag, "1.0", tk.END)
 
         text_widget.delete("1.0", tk.END)
         text_widget.insert("1.0", json_str)
-
-        for match in re.finditer(key_pattern, json_str):
-            start, end = match.span(1)
-            text_widget.tag_add("key", f"1.0+{start}c", f"1.0+{end}c")
-        for match in re.finditer(string_pattern, json_str):
-            start, end = match.span(1)
-            text_widget.tag_add("string", f"1.0+{start}c", f"1.0+{end}c")
-        for match in re.finditer(number_pattern, json_str):
-            start, end = match.span(2)
-            text_widget.tag_add("number", f"1.0+{start}c", f"1.0+{end}c")
-        for match in re.finditer(boolean_pattern, json_str):
-            start, end = match.span(2)
-            text_widget.tag_add("boolean", f"1.0+{start}c", f"1.0+{end}c")
-        for match in re.finditer(null_pattern, json_str):
-            start, end = match.span(0)
-            text_widget.tag_add("null", f"1.0+{start}c", f"1.0+{end}c")
+        self._apply_tag_ranges(text_widget, _json_tag_ranges(json_str))
+        if text_widget is self.output_text:
+            # a full pass supersedes any pending edit-driven one
+            if self._hl_job is not None:
+                self.after_cancel(self._hl_job)
+                self._hl_job = None
+            text_widget.edit_modified(False)
+            self._hl_dirty, self._hl_lines = None, json_str.count("\n") + 1
+
+    def _apply_tag_ranges(self, text_widget, ranges):
+        # Tk takes any number of index pairs per "tag add": one call per tag
+        for tag, idx in ranges.items():
+            if idx:
+                text_widget.tag_add(tag, *idx)
+
+    def _on_output_modified(self, _event=None):
+        # <<Modified>> also fires when the flag is reset; only react to real edits
+        if not self.output_text.edit_modified():
+            return
+        self.output_text.edit_modified(False)
+        self._last_output = None  # hand-edited: save/copy must read the widget
+        line = int(self.output_text.index("insert").partition(".")[0])
+        first, last = self._hl_dirty or (line, line)
+        self._hl_dirty = (min(first, line), max(last, line))
+        if self._hl_job is not None:
+            self.after_cancel(self._hl_job)
+        self._hl_job = self.after(HIGHLIGHT_DEBOUNCE_MS, self._rehighlight_output)
+
+    def _rehighlight_output(self):
+        # retag only the edited lines; lines pasted or deleted during the
+        # burst can shift them, so widen by the line-count change
+        self._hl_job = None
+        if not self._hl_dirty:
+            return
+        out = self.output_text
+        lines = int(out.index("end-1c").partition(".")[0])
+        (first, last), shift = self._hl_dirty, abs(lines - self._hl_lines)
+        self._hl_dirty, self._hl_lines = None, lines
+        first = max(1, first - shift - HIGHLIGHT_CONTEXT_LINES)
+        last = min(lines, last + shift + HIGHLIGHT_CONTEXT_LINES)
+        start, end = f"{first}.0", f"{last}.end"
+        for tag in _HL_TAGS:
+            out.tag_remove(tag, start, end)
+        self._apply_tag_ranges(out, _json_tag_ranges(out.get(start, end), first))
 
     def _about(self):
         messagebox.showinfo("About", "PHP Serialized → JSON\nClean & Convert\n© 2025")
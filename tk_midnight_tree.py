@@ -1,19 +1,60 @@
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from operator import attrgetter
 import tkinter as tk
 from tkinter import filedialog
 
+UI_TICK_MS = 16
+SCAN_WORKERS = 16  # folders listed at once; scandir waits on the disk, not the GIL
+
+def _list_dir(path):
+    """[(name, path, is_dir)] sorted by name, or the error line when path can't be listed."""
+    try:
+        with os.scandir(path) as it:
+            items = list(it)
+        items.sort(key=attrgetter("name"))
+    except Exception as e:
+        return f"[Error] {e}"
+    listing = []
+    for entry in items:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        listing.append((entry.name, entry.path, is_dir))
+    return listing
+
+def _keyword_pattern(keywords):
+    """One case-insensitive alternation for the exclude keywords, or None when there are none."""
+    keywords = [k for k in keywords if k]
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE) if keywords else None
+
 class DirectoryTreeApp:
     def __init__(self, root):
         self.root = root
+        self._walk_executor = ThreadPoolExecutor(max_workers=1)
+        self._scan_executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS)
+        self._walk_cancel = None
         self.root.title("TK-Midnight Tree")
         self.root.configure(bg="#0f0f10")
         self.root.geometry("600x800")
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
         self.create_top_bar()
         self.create_filter_bar()
         self.create_tree_output()
         self.render_tree()
 
+    def _on_close(self):
+        # the pools are not daemonic: drop queued scans so exit doesn't wait for them
+        if self._walk_cancel is not None:
+            self._walk_cancel.set()
+        self._walk_executor.shutdown(wait=False, cancel_futures=True)
+        self._scan_executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+
     def create_top_bar(self):
         top = tk.Frame(self.root, bg="#0f0f10")
         top.grid(row=0, column=0, sticky="ew", padx=10, pady=5)
@@ -80,39 +121,88 @@ class DirectoryTreeApp:
     def render_tree(self):
         path = self.path_var.get().strip()
         max_depth = self.depth_var.get()
-        exclude_folders = [x.strip() for x in self.exclude_var.get().split(",") if x.strip()]
-        exclude_keywords = [x.strip().lower() for x in self.keyword_var.get().split(",") if x.strip()]
+        exclude_folders = frozenset(x.strip() for x in self.exclude_var.get().split(",") if x.strip())
+        exclude_pattern = _keyword_pattern(x.strip() for x in self.keyword_var.get().split(","))
 
+        if self._walk_cancel is not None:
+            self._walk_cancel.set()
+            self._walk_cancel = None
         self.text_output.delete("1.0", tk.END)
         if not os.path.isdir(path):
             self.text_output.insert(tk.END, "Invalid path.")
             return
 
-        self.text_output.insert(tk.END, f"📁 Directory tree for: {path}\n\n")
-        self._print_tree(path, 0, max_depth, "", exclude_folders, exclude_keywords)
+        self.text_output.insert(tk.END, f"📁 Scanning {path}…\n")
+        cancel = self._walk_cancel = threading.Event()
+        future = self._walk_executor.submit(self._walk, cancel, path, max_depth, exclude_folders, exclude_pattern)
+        self.root.after(UI_TICK_MS, self._poll_walk, cancel, future)
 
-    def _print_tree(self, path, depth, max_depth, indent, exclude_folders, exclude_keywords):
-        if depth >= max_depth:
+    def _poll_walk(self, cancel, future):
+        if cancel.is_set():
             return
-        try:
-            items = sorted(os.listdir(path))
-        except Exception as e:
-            self.text_output.insert(tk.END, indent + f"[Error] {e}\n")
+        if not future.done():
+            self.root.after(UI_TICK_MS, self._poll_walk, cancel, future)
             return
-
-        for index, item in enumerate(items):
-            full_path = os.path.join(path, item)
-            item_lower = item.lower()
-
-            if item in exclude_folders or any(keyword in item_lower for keyword in exclude_keywords):
+        self._walk_cancel = None
+        self.text_output.delete("1.0", tk.END)
+        exc = future.exception()
+        # the whole tree goes into the Text widget with one insert
+        self.text_output.insert(tk.END, f"[Error] {exc}\n" if exc is not None else future.result())
+
+    def _walk(self, cancel, path, max_depth, exclude_folders, exclude_pattern):
+        """Runs on the walk thread: list folders in parallel, then build the tree text."""
+        search = exclude_pattern.search if exclude_pattern is not None else None
+
+        def excluded(item):
+            return item in exclude_folders or (search is not None and search(item) is not None)
+
+        # fan out: every listed folder submits its subfolders to the scan pool
+        listings = {}
+        submit = self._scan_executor.submit
+        pending = {submit(_list_dir, path): (path, 0)} if max_depth > 0 else {}
+        while pending:
+            if cancel.is_set():
+                for fut in pending:
+                    fut.cancel()
+                return ""
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                folder, depth = pending.pop(fut)
+                listing = listings[folder] = fut.result()
+                if isinstance(listing, str) or depth + 1 >= max_depth:
+                    continue
+                for item, full_path, is_dir in listing:
+                    if is_dir and not excluded(item):
+                        pending[submit(_list_dir, full_path)] = (full_path, depth + 1)
+
+        # then render depth-first from the listings with an explicit stack
+        parts = [f"📁 Directory tree for: {path}\n\n"]
+        stack = []
+
+        def open_dir(folder, indent):
+            listing = listings.get(folder)
+            if isinstance(listing, str):
+                parts.append(indent + listing + "\n")
+            elif listing is not None:
+                stack.append((indent, len(listing) - 1, enumerate(listing)))
+
+        open_dir(path, "")
+        while stack:
+            indent, last, it = stack[-1]
+            nxt = next(it, None)
+            if nxt is None:
+                stack.pop()
+                continue
+            index, (item, full_path, is_dir) = nxt
+            if excluded(item):
                 continue
 
-            prefix = "└── " if index == len(items) - 1 else "├── "
-            self.text_output.insert(tk.END, indent + prefix + item + "\n")
+            prefix = "└── " if index == last else "├── "
+            parts.append(indent + prefix + item + "\n")
 
-            if os.path.isdir(full_path):
-                new_indent = indent + ("    " if index == len(items) - 1 else "│   ")
-                self._print_tree(full_path, depth + 1, max_depth, new_indent, exclude_folders, exclude_keywords)
+            if is_dir:
+                open_dir(full_path, indent + ("    " if index == last else "│   "))
+        return "".join(parts)
 
     def copy_to_clipboard(self):
         tree_text = self.text_output.get("1.0", tk.END)
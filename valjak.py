@@ -3,10 +3,13 @@ import psutil
 import time
 import logging
 import platform
+import shutil
 import tkinter as tk
 from ttkbootstrap import Style
 from tkinter import ttk, messagebox, filedialog
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, CancelledError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -18,17 +21,51 @@ def check_platform():
 
 check_platform()
 
+OVERWRITE_CHUNK = 1 << 20  # 1 MiB of random data per write
+POLL_MS = 100  # how often the Tk thread checks for a finished folder run
+DELETE_WORKERS = 8  # files deleted concurrently per folder run
+
+def _open_urandom():
+    """Unbuffered /dev/urandom, or None where there is none (Windows)."""
+    try:
+        return open("/dev/urandom", "rb", buffering=0)
+    except OSError:
+        return None
+
 # Secure File Deletion Function
 def secure_delete(file_path, passes=3):
     """Overwrites a file with random data multiple times before deletion."""
     if os.path.exists(file_path):
         try:
             file_size = os.path.getsize(file_path)
-            with open(file_path, "wb") as f:
-                for _ in range(passes):
-                    f.write(os.urandom(file_size))
-                    f.flush()
-                    os.fsync(f.fileno())
+            # r+b writes over the existing blocks ("wb" would truncate first);
+            # one reused buffer, refilled per chunk, whatever the file size
+            buf = memoryview(bytearray(OVERWRITE_CHUNK))
+            rnd = _open_urandom()
+            try:
+                with open(file_path, "r+b", buffering=0) as f:
+                    if file_size and hasattr(os, "posix_fallocate"):
+                        # only does work for sparse files: holes get real blocks up front
+                        # instead of being allocated piecemeal during the first pass
+                        try:
+                            os.posix_fallocate(f.fileno(), 0, file_size)
+                        except OSError:
+                            pass  # not supported by this filesystem
+                    for _ in range(passes):
+                        f.seek(0)
+                        remaining = file_size
+                        while remaining > 0:
+                            chunk = buf[:min(remaining, OVERWRITE_CHUNK)]
+                            if rnd is not None:
+                                chunk = chunk[:rnd.readinto(chunk)]
+                            else:
+                                chunk[:] = os.urandom(len(chunk))
+                            # unbuffered writes may be short: count what actually went out
+                            remaining -= f.write(chunk)
+                        os.fsync(f.fileno())
+            finally:
+                if rnd is not None:
+                    rnd.close()
 
             os.remove(file_path)
             logging.info(f"File '{file_path}' securely deleted after {passes} overwrite passes.")
@@ -37,9 +74,43 @@ def secure_delete(file_path, passes=3):
     else:
         logging.error(f"File '{file_path}' does not exist.")
 
+def _log_rmtree_error(func, path, exc_info):
+    logging.error(f"Failed to delete '{path}': {exc_info[1]}")
+
 # Process Termination Function
+def _pids_with_open_file(file_path):
+    """PIDs with an fd pointing at file_path, read straight from /proc (Linux only)."""
+    target = os.path.realpath(file_path)
+    for pid_entry in os.scandir("/proc"):
+        if not pid_entry.name.isdigit():
+            continue
+        try:
+            with os.scandir(f"/proc/{pid_entry.name}/fd") as fds:
+                for fd in fds:
+                    try:
+                        if os.readlink(fd.path) == target:
+                            yield int(pid_entry.name)
+                            break
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
 def terminate_related_processes(file_path):
     """Finds and terminates processes locking the file."""
+    if platform.system() == "Linux" and os.path.isdir("/proc"):
+        # readlink on /proc/<pid>/fd/* skips psutil building open_files() for every process
+        for pid in _pids_with_open_file(file_path):
+            try:
+                proc = psutil.Process(pid)
+                logging.info(f"Terminating process {proc.name()} (PID: {pid})")
+                proc.terminate()
+                proc.wait()
+            except (psutil.AccessDenied, psutil.NoSuchProcess):
+                pass
+            except Exception as e:
+                logging.error(f"Error terminating process: {e}")
+        return
     for proc in psutil.process_iter(["pid", "name"]):
         try:
             for f in proc.open_files():
@@ -63,10 +134,19 @@ class BootstrapGUI(tk.Tk):
         self.style = Style(theme="darkly")  
         
         self.selected_path = None
-        self.scheduled_task = None
+        self.scheduled_task = None  # after() id of the next scheduled run
+        self.auto_active = False
+        self._auto_gen = 0  # bumped on every start; callbacks of older starts drop out
         self.secure_delete_enabled = tk.BooleanVar(value=True)  # Checkbox for secure deletion
         self.interval_var = tk.IntVar(value=10)  # Default deletion interval (in seconds)
 
+        # one worker runs folder deletions; Tk is only touched from this thread
+        self._jobs = queue.Queue()
+        self._done = queue.Queue()
+        self._delete_pool = None  # pool of the run in progress, so stop can cancel it
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+
         self.create_widgets()
 
     def create_widgets(self):
@@ -147,35 +227,120 @@ class BootstrapGUI(tk.Tk):
             messagebox.showerror("Error", "Please select a folder for scheduled deletion!")
             return
 
+        if self.auto_active:
+            self.stop_scheduled_deletion(notify=False)
         self.progress.start()
         interval = self.interval_var.get()
-        self.scheduled_task = threading.Timer(interval, self.auto_delete_folder)  # Delete every 'interval' seconds
-        self.scheduled_task.start()
+        self.auto_active = True
+        self._auto_gen += 1
+        self._schedule_auto_delete(interval)  # Delete every 'interval' seconds
         messagebox.showinfo("Started", f"Auto-deletion initiated for folder every {interval} seconds!")
 
-    def stop_scheduled_deletion(self):
+    def stop_scheduled_deletion(self, notify=True):
         """Stop scheduled deletion."""
-        if self.scheduled_task:
-            self.scheduled_task.cancel()
+        if self.auto_active:
+            self.auto_active = False
+            if self.scheduled_task:
+                self.after_cancel(self.scheduled_task)
+                self.scheduled_task = None
+            pool = self._delete_pool
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)  # files already being overwritten finish
             self.progress.stop()
-            messagebox.showinfo("Stopped", "Auto-deletion stopped!")
+            if notify:
+                messagebox.showinfo("Stopped", "Auto-deletion stopped!")
 
-    def auto_delete_folder(self):
-        """Delete all files in the selected folder in the background."""
-        for file in os.listdir(self.selected_path):
-            file_path = os.path.join(self.selected_path, file)
+    def _schedule_auto_delete(self, interval):
+        if self.scheduled_task:
+            self.after_cancel(self.scheduled_task)
+        self.scheduled_task = self.after(interval * 1000, self._enqueue_auto_delete, self._auto_gen)
+
+    def _enqueue_auto_delete(self, gen):
+        # Tk variables are read here; the worker only gets plain values
+        self.scheduled_task = None
+        if not self.auto_active or gen != self._auto_gen:
+            return
+        self._jobs.put((gen, self.selected_path, self.secure_delete_enabled.get()))
+        self.after(POLL_MS, self._poll_auto_delete, gen)
+
+    def _worker_loop(self):
+        while True:
+            gen, folder, secure = self._jobs.get()
+            try:
+                self.auto_delete_folder(folder, secure)
+            except Exception as e:
+                logging.error(f"Auto-deletion of '{folder}' failed: {e}")
+            self._done.put(gen)
+
+    def _poll_auto_delete(self, gen):
+        if not self.auto_active or gen != self._auto_gen:
+            return  # stopped or restarted while the run was in progress
+        try:
+            done_gen = self._done.get_nowait()
+        except queue.Empty:
+            done_gen = None
+        if done_gen != gen:
+            # still running, or a run from before a restart finished: keep waiting
+            self.after(POLL_MS, self._poll_auto_delete, gen)
+            return
+        self.progress.stop()
+        interval = self.interval_var.get()
+        messagebox.showinfo("Completed", f"Auto-deletion completed! Restarting in {interval} seconds.")
+        # the next run is only scheduled once this one has finished, so runs never overlap
+        if self.auto_active and gen == self._auto_gen:
+            self._schedule_auto_delete(interval)
+
+    def auto_delete_folder(self, folder, secure):
+        """Delete everything inside folder, subfolders included; runs on the worker thread."""
+        files, dirs = [], []
+        if secure:
+            # every file in the tree is overwritten; bottom-up, so subfolders come before parents
+            for root, dirnames, filenames in os.walk(folder, topdown=False):
+                files.extend(os.path.join(root, name) for name in filenames)
+                dirs.extend(os.path.join(root, name) for name in dirnames)
+        else:
+            # plain deletes: top-level files go through the pool, subfolders to rmtree whole
+            with os.scandir(folder) as it:
+                for entry in it:
+                    (dirs if entry.is_dir(follow_symlinks=False) else files).append(entry.path)
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as ex:
+            self._delete_pool = ex
+            try:
+                list(ex.map(lambda p: self._delete_one(p, secure), files))
+            except CancelledError:
+                logging.info(f"Auto-deletion of '{folder}' stopped.")
+                return
+            finally:
+                self._delete_pool = None
+        for path in dirs:
+            if not secure:
+                shutil.rmtree(path, onerror=_log_rmtree_error)
+                logging.info(f"Folder '{path}' deleted without secure overwrite.")
+                continue
+            try:
+                if os.path.islink(path):
+                    os.remove(path)  # os.walk lists but does not follow folder symlinks
+                else:
+                    os.rmdir(path)
+            except OSError as e:
+                logging.error(f"Failed to remove folder '{path}': {e}")
+
+    def _delete_one(self, file_path, secure):
+        # one file failing must not abort the rest of the run
+        try:
+            if os.path.islink(file_path):
+                # never overwrite through a link: its target may be outside the folder
+                os.remove(file_path)
+                logging.info(f"Link '{file_path}' removed; its target was left untouched.")
+                return
             terminate_related_processes(file_path)
-            if self.secure_delete_enabled.get():
+            if secure:
                 secure_delete(file_path)
             else:
                 os.remove(file_path)
                 logging.info(f"File '{file_path}' deleted without secure overwrite.")
-
-        self.progress.stop()
-        interval = self.interval_var.get()
-        messagebox.showinfo("Completed", f"Auto-deletion completed! Restarting in {interval} seconds.")
-        self.scheduled_task = threading.Timer(interval, self.auto_delete_folder)
-        self.scheduled_task.start()
+        except Exception as e:
+            logging.error(f"Failed to delete '{file_path}': {e}")
 
 if __name__ == "__main__":
     app = BootstrapGUI()